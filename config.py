@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from decouple import config
 from typing import Dict, List
 import os
@@ -9,13 +10,31 @@ BASE_DIR = Path(__file__).resolve().parent
 LOGS_DIR = BASE_DIR / "logs"
 LOGS_DIR.mkdir(exist_ok=True)
 
+@dataclass(frozen=True, slots=True)
+class _Env:
+    PAPER_TRADING: bool
+    PAPER_TRADING_BALANCE: float
+    BINANCE_API_KEY: str
+    BINANCE_API_SECRET: str
+
+def _env() -> _Env:
+    """Read every environment setting once and return them together."""
+    return _Env(
+        PAPER_TRADING=config('PAPER_TRADING', default=True, cast=bool),
+        PAPER_TRADING_BALANCE=config('PAPER_TRADING_BALANCE', default=1000.0, cast=float),
+        BINANCE_API_KEY=config('BINANCE_API_KEY', default=''),
+        BINANCE_API_SECRET=config('BINANCE_API_SECRET', default=''),
+    )
+
+_ENV = _env()
+
 # Paper trading mode
-PAPER_TRADING = config('PAPER_TRADING', default=True, cast=bool)
-PAPER_TRADING_BALANCE = config('PAPER_TRADING_BALANCE', default=1000.0, cast=float)
+PAPER_TRADING = _ENV.PAPER_TRADING
+PAPER_TRADING_BALANCE = _ENV.PAPER_TRADING_BALANCE
 
 # Exchange API credentials
-BINANCE_API_KEY = config('BINANCE_API_KEY', default='')
-BINANCE_API_SECRET = config('BINANCE_API_SECRET', default='')
+BINANCE_API_KEY = _ENV.BINANCE_API_KEY
+BINANCE_API_SECRET = _ENV.BINANCE_API_SECRET
 
 # Only validate API credentials if not in paper trading mode
 if not PAPER_TRADING and (not BINANCE_API_KEY or not BINANCE_API_SECRET):
@@ -23,30 +42,49 @@ if not PAPER_TRADING and (not BINANCE_API_KEY or not BINANCE_API_SECRET):
     raise ValueError("Missing Binance API credentials")
 
 # Trading parameters
-TRADING_CONFIG = {
-    'MIN_FUNDING_RATE': -0.001,    # -0.1% (increased from -0.01%)
-    'MAX_POSITION_PERCENT': 0.2,   # 20% of capital per trade
-    'MAX_LEVERAGE': 5,             # Increased from 3
-    'STOP_LOSS': 0.05,             # 5%
-    'TAKE_PROFIT': 0.02,           # 2%
-    'MIN_LIQUIDITY': 0.01,         # Minimum liquidity in BTC (about $400 at $40k BTC price)
-    'MIN_POSITION_SIZE': 4,        # Minimum position size of $4 (adjusted to match current balance)
-    'MAX_POSITION_SIZE': 1000,     # Maximum position size of $1000
-    'USE_MAKER_ORDERS': True,      # Use maker orders to reduce fees
-    'USE_BNB_FEES': True,          # Use BNB to pay fees for discounts
-    'MIN_FUNDING_RATE_IMPROVEMENT': 0.3,  # Exit when funding rate improves by 30%
-    'MAX_POSITION_DURATION': 72 * 3600,  # Hold positions for up to 72 hours (9 funding periods)
-}
+@dataclass(frozen=True, slots=True)
+class TradingConfig:
+    MIN_FUNDING_RATE: float = -0.001       # -0.1% (increased from -0.01%)
+    MAX_POSITION_PERCENT: float = 0.2      # 20% of capital per trade
+    MAX_LEVERAGE: int = 5                  # Increased from 3
+    STOP_LOSS: float = 0.05                # 5%
+    TAKE_PROFIT: float = 0.02              # 2%
+    MIN_LIQUIDITY: float = 0.01            # Minimum liquidity in BTC (about $400 at $40k BTC price)
+    MIN_POSITION_SIZE: float = 4           # Minimum position size of $4 (adjusted to match current balance)
+    MAX_POSITION_SIZE: float = 1000        # Maximum position size of $1000
+    USE_MAKER_ORDERS: bool = True          # Use maker orders to reduce fees
+    USE_BNB_FEES: bool = True              # Use BNB to pay fees for discounts
+    MIN_FUNDING_RATE_IMPROVEMENT: float = 0.3  # Exit when funding rate improves by 30%
+    MAX_POSITION_DURATION: int = 72 * 3600  # Hold positions for up to 72 hours (9 funding periods)
+
+TRADING_CONFIG = TradingConfig()
+
+# Exchange fee rates, shared by the profitability model and simulated fills
+SPOT_FEE = 0.00075  # 0.075% with BNB
+FUTURES_FEE = 0.0004  # 0.04% taker fee
 
 # Monitoring intervals (in seconds)
 MONITORING_CONFIG = {
     'CHECK_INTERVAL': 60,          # Check every minute (reduced from 5 minutes)
     'HEARTBEAT_INTERVAL': 3600,    # 1 hour
     'POSITION_CHECK_INTERVAL': 10,  # 10 seconds
+    'BALANCE_CACHE_TTL': 2,        # Reuse a fetched balance for 2 seconds unless an order was placed
+    'STATE_SAVE_DELAY': 0.5,       # Coalesce state changes within half a second into one write
+    'STATE_SAVE_INTERVAL': 5,      # Minimum seconds between state file writes
+    'SHUTDOWN_TIMEOUT': 10,        # Seconds allowed for closing all positions on shutdown
+}
+
+# HTTP connection pool shared by the spot and futures clients
+HTTP_CONFIG = {
+    'POOL_SIZE': 32,               # Maximum simultaneous connections
+    'KEEPALIVE_TIMEOUT': 60,       # Seconds to keep idle connections open
+    'DNS_CACHE_TTL': 300,          # Seconds to cache resolved Binance hosts
+    'REQUESTS_PER_MINUTE': 1200,   # Binance IP weight limit shared by all REST calls
+    'QUOTE_JSON_NUMBERS': True,    # Keep ccxt's exact string numbers; False decodes with orjson into floats
 }
 
 # Trading pairs to monitor (focusing on high volatility pairs)
-TRADING_PAIRS = [
+TRADING_PAIRS = (
     "BTCUSDT",
     "ETHUSDT",
     "SOLUSDT",
@@ -57,7 +95,7 @@ TRADING_PAIRS = [
     "LINKUSDT",
     "UNIUSDT",
     "AAVEUSDT",
-]
+)
 
 # Risk management
 RISK_CONFIG = {
@@ -1,51 +1,289 @@
-import ccxt
-from typing import Dict, Optional, Tuple, List
+import asyncio
+import aiohttp
+from aiolimiter import AsyncLimiter
+import ccxt.async_support as ccxt
+import numpy as np
+import orjson
+import pickle
+from functools import cached_property
+from typing import Callable, Dict, Optional, Tuple, List, Sequence
 import time
 from loguru import logger
-from config import BINANCE_API_KEY, BINANCE_API_SECRET, TRADING_CONFIG
+from config import BINANCE_API_KEY, BINANCE_API_SECRET, TRADING_CONFIG, HTTP_CONFIG, LOGS_DIR, SPOT_FEE, FUTURES_FEE
+
+# Native-compiled profitability math where numba is installed; plain NumPy otherwise
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+# Funding payments settle every 8 hours
+_FUNDING_PERIOD_SEC = 8 * 3600
+
+# Funding history only changes once per funding period
+_FR_HISTORY_TTL = _FUNDING_PERIOD_SEC
+
+# Market metadata changes rarely; reuse a persisted copy for up to a day
+_MARKETS_CACHE_TTL = 24 * 3600
+
+# Pushed market data streams
+_FUNDING_STREAM_URL = "wss://fstream.binance.com/ws/!markPrice@arr@1s"
+_DEPTH_STREAM_URL = "wss://stream.binance.com:9443/stream?streams="
+_DEPTH_STREAM_LEVELS = 10
+_STREAM_MAX_AGE = 5  # Seconds before a streamed value is considered stale
+_STREAM_RECONNECT_DELAY = 5
+
+# Signed requests are stamped with a locally kept server offset, refreshed periodically
+_TIME_SYNC_INTERVAL = 30 * 60
+
+# Profitability constants derived from static configuration
+_DAYS_TO_HOLD = TRADING_CONFIG.MAX_POSITION_DURATION / 86400.0
+_EXPECTED_PAYMENTS = _DAYS_TO_HOLD * 3  # 3 payments per day
+_FEE_ROUNDTRIP = (SPOT_FEE + FUTURES_FEE) * 2  # *2 for entry and exit
+BREAK_EVEN_RATE = _FEE_ROUNDTRIP / _EXPECTED_PAYMENTS  # Independent of position size
+
+# Columns of the profitability kernel output
+_AVG, _MIN, _FEES, _EXPECTED, _TO_BREAKEVEN, _WORST_PROFIT, _WORST_NET = range(7)
+
+def _profitability_numpy(rates: np.ndarray, lengths: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    """Profitability columns per row of a NaN-padded rate matrix (vectorized NumPy)."""
+    out = np.empty((rates.shape[0], 7))
+    out[:, _AVG] = np.nanmean(rates, axis=1)
+    out[:, _MIN] = np.nanmin(rates, axis=1)
+    size_abs_min = sizes * np.abs(out[:, _MIN])  # Funding received per payment at the worst rate
+    out[:, _FEES] = sizes * _FEE_ROUNDTRIP
+    out[:, _EXPECTED] = size_abs_min * _EXPECTED_PAYMENTS
+    with np.errstate(divide='ignore'):
+        out[:, _TO_BREAKEVEN] = out[:, _FEES] / size_abs_min
+    out[:, _WORST_PROFIT] = size_abs_min  # Funding rate rises after 1 payment
+    out[:, _WORST_NET] = size_abs_min - out[:, _FEES]
+    return out
+
+def _profitability_loop(rates, lengths, sizes):
+    """Same as _profitability_numpy, as explicit loops over the first lengths[i] values of each row.
+    
+    Rows are independent, so numba spreads them across cores.
+    """
+    out = np.empty((rates.shape[0], 7))
+    for i in prange(rates.shape[0]):
+        total = 0.0
+        mn = rates[i, 0]
+        for j in range(lengths[i]):
+            v = rates[i, j]
+            total += v
+            if v < mn:
+                mn = v
+        size_abs_min = sizes[i] * abs(mn)
+        fees = sizes[i] * _FEE_ROUNDTRIP
+        out[i, _AVG] = total / lengths[i]
+        out[i, _MIN] = mn
+        out[i, _FEES] = fees
+        out[i, _EXPECTED] = size_abs_min * _EXPECTED_PAYMENTS
+        out[i, _TO_BREAKEVEN] = fees / size_abs_min
+        out[i, _WORST_PROFIT] = size_abs_min
+        out[i, _WORST_NET] = size_abs_min - fees
+    return out
+
+if njit is not None:
+    # error_model='numpy' keeps IEEE semantics (inf) for a zero worst-case rate instead of raising
+    _profitability_core = njit(parallel=True, cache=True, error_model='numpy')(_profitability_loop)
+    # Compile (or load the on-disk cache) now so the first analysis doesn't pay for it
+    _profitability_core(np.zeros((1, 30)), np.full(1, 30, dtype=np.int64), np.ones(1))
+else:
+    _profitability_core = _profitability_numpy
+
+class _Binance(ccxt.binance):
+    """ccxt Binance client that can decode REST responses with orjson.
+    
+    By default ccxt parses JSON numbers as strings (quoteJsonNumbers) so prices
+    and amounts keep their exact decimal text; orjson cannot do that and would
+    hand back floats. It is therefore only used when HTTP_CONFIG turns quoting
+    off, trading that precision for faster decoding.
+    """
+
+    def on_json_response(self, response_body):
+        if self.quoteJsonNumbers:
+            return super().on_json_response(response_body)
+        return orjson.loads(response_body)
+
+def _has_depth(levels: List[List[float]], threshold: float) -> bool:
+    """Return True once the top 10 [price, amount] levels add up to the threshold."""
+    total = 0.0
+    for _, amount in levels[:10]:
+        total += amount
+        if total >= threshold:
+            return True
+    return False
 
 class BinanceClient:
     def __init__(self):
+        # Token bucket shared by every REST call; lets bursts through up to the weight limit
+        self._limiter = AsyncLimiter(HTTP_CONFIG['REQUESTS_PER_MINUTE'], 60)
+        
+        # (symbol, limit) -> (fetched at, history)
+        self._fr_history_cache: Dict[Tuple[str, int], Tuple[float, List[Dict]]] = {}
+        self._fr_history_refreshing: Dict[Tuple[str, int], asyncio.Task] = {}
+        # symbol -> (history the analyses were computed from, position size -> analysis)
+        self._analysis_cache: Dict[str, Tuple[List[Dict], Dict[float, Dict]]] = {}
+        # Names of clients whose markets were restored from the on-disk cache
+        self._markets_from_cache: set = set()
+        
+        # Latest streamed values: symbol -> (value, received at)
+        self._funding_cache: Dict[str, Tuple[float, float]] = {}
+        self._ob_cache: Dict[str, Tuple[Dict, float]] = {}
+        self._stream_tasks: List[asyncio.Task] = []
+        self._funding_listeners: List[Callable[[Dict[str, float]], None]] = []
+        self._time_sync_task: Optional[asyncio.Task] = None
+
+    @cached_property
+    def session(self) -> aiohttp.ClientSession:
+        """Keep-alive connection pool shared by both clients, created on first use."""
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=HTTP_CONFIG['POOL_SIZE'],
+                keepalive_timeout=HTTP_CONFIG['KEEPALIVE_TIMEOUT'],
+                ttl_dns_cache=HTTP_CONFIG['DNS_CACHE_TTL'],
+            )
+        )
+
+    @cached_property
+    def spot(self) -> ccxt.binance:
+        """Spot exchange client, created on first use."""
+        return self._restore_markets('spot', _Binance({
+            'apiKey': BINANCE_API_KEY,
+            'secret': BINANCE_API_SECRET,
+            'enableRateLimit': False,  # Throttled by the shared limiter in _call()
+            'session': self.session,
+            'quoteJsonNumbers': HTTP_CONFIG['QUOTE_JSON_NUMBERS'],
+            'options': {
+                'defaultType': 'spot',
+                'useSpotWallet': True,
+                'useBNBFees': TRADING_CONFIG.USE_BNB_FEES,
+            }
+        }))
+
+    @cached_property
+    def futures(self) -> ccxt.binance:
+        """Futures exchange client, created on first use."""
+        return self._restore_markets('futures', _Binance({
+            'apiKey': BINANCE_API_KEY,
+            'secret': BINANCE_API_SECRET,
+            'enableRateLimit': False,  # Throttled by the shared limiter in _call()
+            'session': self.session,
+            'quoteJsonNumbers': HTTP_CONFIG['QUOTE_JSON_NUMBERS'],
+            'options': {
+                'defaultType': 'future',
+            }
+        }))
+
+    async def _call(self, method, *args, **kwargs):
+        """Invoke a ccxt client method once the rate limiter grants a token."""
+        async with self._limiter:
+            return await method(*args, **kwargs)
+
+    def _restore_markets(self, name: str, client: ccxt.binance) -> ccxt.binance:
+        """Seed a client with persisted market metadata if the cache is fresh enough."""
+        cache_file = LOGS_DIR / f"markets_{name}.pkl"
         try:
-            # Initialize spot client
-            self.spot = ccxt.binance({
-                'apiKey': BINANCE_API_KEY,
-                'secret': BINANCE_API_SECRET,
-                'enableRateLimit': True,
-                'options': {
-                    'defaultType': 'spot',
-                    'useSpotWallet': True,
-                    'useBNBFees': TRADING_CONFIG['USE_BNB_FEES'],
-                }
-            })
-            
-            # Initialize futures client
-            self.futures = ccxt.binance({
-                'apiKey': BINANCE_API_KEY,
-                'secret': BINANCE_API_SECRET,
-                'enableRateLimit': True,
-                'options': {
-                    'defaultType': 'future',
-                }
-            })
-            
-            # Test API connection
-            self._test_connection()
-            
+            if time.time() - cache_file.stat().st_mtime < _MARKETS_CACHE_TTL:
+                with open(cache_file, 'rb') as f:
+                    client.set_markets(pickle.load(f))
+                self._markets_from_cache.add(name)
+                logger.debug(f"Loaded {name} markets from {cache_file}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("Ignoring unreadable markets cache {}: {}", cache_file, e)
+        return client
+
+    def _persist_markets(self, name: str, client: ccxt.binance):
+        """Save freshly loaded market metadata so the next start can skip load_markets()."""
+        if not client.markets or name in self._markets_from_cache:
+            return
+        cache_file = LOGS_DIR / f"markets_{name}.pkl"
+        try:
+            with open(cache_file, 'wb') as f:
+                pickle.dump(client.markets, f, protocol=pickle.HIGHEST_PROTOCOL)
         except Exception as e:
-            logger.error(f"Failed to initialize exchange clients: {str(e)}")
+            logger.warning("Failed to save markets cache {}: {}", cache_file, e)
+
+    async def connect(self):
+        """Verify API credentials and permissions before live trading."""
+        try:
+            await self.sync_time()
+            await self._test_connection()
+        except Exception as e:
+            logger.opt(exception=e).error("Failed to initialize exchange clients")
+            await self.close()
             raise
+        self._time_sync_task = asyncio.create_task(self._time_sync_loop())
+        
+    async def sync_time(self):
+        """Measure the offset to Binance server time and apply it to both clients.
+        
+        ccxt stamps signed requests with local time minus options['timeDifference'],
+        so keeping that offset current means orders never need a /time round-trip.
+        """
+        server_time = await self._call(self.futures.fetch_time)
+        time_difference = self.futures.milliseconds() - server_time
+        for client in (self.spot, self.futures):
+            client.options['timeDifference'] = time_difference
+        logger.debug(f"Local clock is {time_difference} ms ahead of Binance")
+        
+    async def _time_sync_loop(self):
+        """Refresh the server time offset to follow local clock drift."""
+        while True:
+            await asyncio.sleep(_TIME_SYNC_INTERVAL)
+            try:
+                await self.sync_time()
+            except Exception as e:
+                logger.warning("Failed to resync server time: {}", e)
+
+    async def close(self):
+        """Close whichever exchange clients were created and the shared HTTP session.
+        
+        Background work that still holds the session is cancelled first. The
+        clients and session are then dropped, so any later use builds a fresh
+        pool instead of failing on a closed one.
+        """
+        background = self._stream_tasks + list(self._fr_history_refreshing.values())
+        if self._time_sync_task is not None:
+            background.append(self._time_sync_task)
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        self._stream_tasks = []
+        self._time_sync_task = None
+        
+        for name in ('spot', 'futures'):
+            client = self.__dict__.pop(name, None)
+            if client is not None:
+                self._persist_markets(name, client)
+                self._markets_from_cache.discard(name)
+                await client.close()
+        session = self.__dict__.pop('session', None)
+        if session is not None and not session.closed:
+            await session.close()
+            
+    async def _test_spot(self):
+        """Test the spot API connection."""
+        await self._call(self.spot.fetch_balance)
+        logger.info("Successfully connected to Binance Spot API")
+
+    async def _test_futures(self):
+        """Test the futures API connection."""
+        await self._call(self.futures.fetch_balance)
+        logger.info("Successfully connected to Binance Futures API")
             
-    def _test_connection(self):
+    async def _test_connection(self):
         """Test API connection and permissions."""
         try:
-            # Test spot API
-            self.spot.fetch_balance()
-            logger.info("Successfully connected to Binance Spot API")
-            
-            # Test futures API
-            self.futures.fetch_balance()
-            logger.info("Successfully connected to Binance Futures API")
+            # Probe both APIs concurrently; wait for both before surfacing a failure
+            results = await asyncio.gather(self._test_spot(), self._test_futures(), return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
             
         except ccxt.AuthenticationError as e:
             logger.error("Authentication failed. Please check your API credentials.")
@@ -54,15 +292,76 @@ class BinanceClient:
             logger.error("Network error. Please check your internet connection.")
             raise
         except Exception as e:
-            logger.error(f"Failed to test API connection: {str(e)}")
+            logger.opt(exception=e).error("Failed to test API connection")
             raise
             
-    def get_funding_rate(self, symbol: str) -> float:
+    async def start_streams(self, symbols: Sequence[str]):
+        """Subscribe to pushed funding rates and spot order book depth.
+        
+        Funding rates for every futures symbol arrive once per second on a single
+        connection; depth snapshots for the given symbols arrive on a second one.
+        While those values are fresh, the getters below serve them without REST calls.
+        """
+        if self._stream_tasks:
+            return
+        depth_streams = '/'.join(f"{symbol.lower()}@depth{_DEPTH_STREAM_LEVELS}" for symbol in symbols)
+        self._stream_tasks = [
+            asyncio.create_task(self._run_stream(_FUNDING_STREAM_URL, self._on_mark_prices)),
+            asyncio.create_task(self._run_stream(_DEPTH_STREAM_URL + depth_streams, self._on_depth)),
+        ]
+        
+    async def _run_stream(self, url: str, handler):
+        """Keep a websocket subscription alive, reconnecting after failures."""
+        while True:
+            try:
+                async with self.session.ws_connect(url, heartbeat=30) as ws:
+                    logger.info(f"Subscribed to {url}")
+                    async for message in ws:
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            handler(message.json(loads=orjson.loads))
+                        elif message.type == aiohttp.WSMsgType.ERROR:
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Stream {} failed: {}", url, e)
+            await asyncio.sleep(_STREAM_RECONNECT_DELAY)
+            
+    def add_funding_listener(self, listener: Callable[[Dict[str, float]], None]):
+        """Register a callback invoked with {symbol: funding rate} on every streamed update."""
+        self._funding_listeners.append(listener)
+            
+    def _on_mark_prices(self, events: List[Dict]):
+        """Store funding rates from a !markPrice@arr update and notify listeners."""
+        received_at = time.monotonic()
+        rates = {event['s']: float(event['r']) for event in events}
+        for symbol, rate in rates.items():
+            self._funding_cache[symbol] = (rate, received_at)
+        for listener in self._funding_listeners:
+            listener(rates)
+            
+    def _on_depth(self, message: Dict):
+        """Store a partial depth snapshot; levels are converted to floats on read."""
+        symbol = message['stream'].split('@', 1)[0].upper()
+        self._ob_cache[symbol] = (message['data'], time.monotonic())
+        
+    def _cached_funding_rate(self, symbol: str) -> Optional[float]:
+        """Return the streamed funding rate for a symbol if it is fresh."""
+        cached = self._funding_cache.get(symbol)
+        if cached is not None and time.monotonic() - cached[1] < _STREAM_MAX_AGE:
+            return cached[0]
+        return None
+            
+    async def get_funding_rate(self, symbol: str) -> float:
         """Get the current funding rate for a symbol."""
+        funding_rate = self._cached_funding_rate(symbol)
+        if funding_rate is not None:
+            return funding_rate
+            
         try:
-            logger.info(f"Fetching funding rate for {symbol}...")
-            funding_info = self.futures.fetch_funding_rate(symbol)
-            logger.info(f"Raw funding info for {symbol}: {funding_info}")
+            logger.debug("Fetching funding rate for {}...", symbol)
+            funding_info = await self._call(self.futures.fetch_funding_rate, symbol)
+            logger.opt(lazy=True).debug("Raw funding info for {}: {}", lambda: symbol, lambda: funding_info)
             
             if not funding_info:
                 logger.error(f"No funding info returned for {symbol}")
@@ -73,33 +372,84 @@ class BinanceClient:
             return funding_rate
             
         except ccxt.NetworkError as e:
-            logger.error(f"Network error while fetching funding rate for {symbol}: {str(e)}")
+            logger.error("Network error while fetching funding rate for {}: {}", symbol, e)
             return 0.0
         except ccxt.ExchangeError as e:
-            logger.error(f"Exchange error while fetching funding rate for {symbol}: {str(e)}")
+            logger.error("Exchange error while fetching funding rate for {}: {}", symbol, e)
             return 0.0
         except Exception as e:
-            logger.error(f"Error fetching funding rate for {symbol}: {str(e)}")
+            logger.opt(exception=e).error("Error fetching funding rate for {}", symbol)
             return 0.0
             
-    def get_order_book(self, symbol: str, limit: int = 10) -> Dict:
+    async def get_all_funding_rates(self, symbols: Sequence[str]) -> Dict[str, float]:
+        """Get the current funding rates for several symbols in one round-trip.
+        
+        Symbols whose rate could not be fetched are left out rather than reported as 0.
+        """
+        streamed = {symbol: self._cached_funding_rate(symbol) for symbol in symbols}
+        if None not in streamed.values():
+            return streamed
+            
+        try:
+            if self.futures.has.get('fetchFundingRates'):
+                # Single premiumIndex call covering every symbol; results are keyed
+                # by unified symbol, so map them back via the raw exchange id
+                funding_infos = await self._call(self.futures.fetch_funding_rates, symbols)
+                by_id = {info.get('info', {}).get('symbol'): info for info in funding_infos.values()}
+                funding_infos = [by_id.get(symbol) for symbol in symbols]
+            else:
+                # One failing symbol must not discard the rates fetched for the others
+                results = await asyncio.gather(
+                    *[self._call(self.futures.fetch_funding_rate, symbol) for symbol in symbols],
+                    return_exceptions=True
+                )
+                funding_infos = []
+                for symbol, result in zip(symbols, results):
+                    if isinstance(result, Exception):
+                        logger.error("Error fetching funding rate for {}: {}", symbol, result)
+                        result = None
+                    funding_infos.append(result)
+            return {
+                symbol: float(info.get('fundingRate') or 0)
+                for symbol, info in zip(symbols, funding_infos)
+                if info
+            }
+        except ccxt.NetworkError as e:
+            logger.error("Network error while fetching funding rates: {}", e)
+            return {}
+        except ccxt.ExchangeError as e:
+            logger.error("Exchange error while fetching funding rates: {}", e)
+            return {}
+        except Exception as e:
+            logger.opt(exception=e).error("Error fetching funding rates")
+            return {}
+            
+    async def get_order_book(self, symbol: str, limit: int = 10) -> Dict:
         """Get the order book for a symbol."""
+        cached = self._ob_cache.get(symbol)
+        if cached is not None and limit <= _DEPTH_STREAM_LEVELS and time.monotonic() - cached[1] < _STREAM_MAX_AGE:
+            depth = cached[0]
+            return {
+                'bids': [[float(price), float(amount)] for price, amount in depth['bids'][:limit]],
+                'asks': [[float(price), float(amount)] for price, amount in depth['asks'][:limit]],
+            }
+            
         try:
-            order_book = self.spot.fetch_order_book(symbol, limit)
+            order_book = await self._call(self.spot.fetch_order_book, symbol, limit)
             if not order_book['bids'] or not order_book['asks']:
                 logger.warning(f"Empty order book for {symbol}")
             return order_book
         except ccxt.NetworkError as e:
-            logger.error(f"Network error while fetching order book for {symbol}: {str(e)}")
+            logger.error("Network error while fetching order book for {}: {}", symbol, e)
             return {'bids': [], 'asks': []}
         except Exception as e:
-            logger.error(f"Error fetching order book for {symbol}: {str(e)}")
+            logger.opt(exception=e).error("Error fetching order book for {}", symbol)
             return {'bids': [], 'asks': []}
             
-    def get_best_maker_price(self, symbol: str, side: str) -> Optional[float]:
+    async def get_best_maker_price(self, symbol: str, side: str) -> Optional[float]:
         """Get the best price for a maker order."""
         try:
-            order_book = self.get_order_book(symbol)
+            order_book = await self.get_order_book(symbol)
             if side == 'BUY':
                 # For buy orders, we need to be below the best ask
                 return float(order_book['asks'][0][0]) * 0.999  # 0.1% below best ask
@@ -107,21 +457,22 @@ class BinanceClient:
                 # For sell orders, we need to be above the best bid
                 return float(order_book['bids'][0][0]) * 1.001  # 0.1% above best bid
         except Exception as e:
-            logger.error(f"Error getting best maker price for {symbol}: {str(e)}")
+            logger.opt(exception=e).error("Error getting best maker price for {}", symbol)
             return None
             
-    def create_spot_order(self, symbol: str, order_type: str, side: str, 
+    async def create_spot_order(self, symbol: str, order_type: str, side: str, 
                          amount: float, price: Optional[float] = None) -> Dict:
         """Create a spot order."""
         try:
             # Validate amount
-            if amount < TRADING_CONFIG['MIN_POSITION_SIZE']:
-                raise ValueError(f"Order amount {amount} is below minimum {TRADING_CONFIG['MIN_POSITION_SIZE']}")
-            if amount > TRADING_CONFIG['MAX_POSITION_SIZE']:
-                raise ValueError(f"Order amount {amount} exceeds maximum {TRADING_CONFIG['MAX_POSITION_SIZE']}")
+            if amount < TRADING_CONFIG.MIN_POSITION_SIZE:
+                raise ValueError(f"Order amount {amount} is below minimum {TRADING_CONFIG.MIN_POSITION_SIZE}")
+            if amount > TRADING_CONFIG.MAX_POSITION_SIZE:
+                raise ValueError(f"Order amount {amount} exceeds maximum {TRADING_CONFIG.MAX_POSITION_SIZE}")
                 
             # Always use market orders for spot
-            order = self.spot.create_order(
+            order = await self._call(
+                self.spot.create_order,
                 symbol=symbol,
                 type='MARKET',
                 side=side,
@@ -130,27 +481,28 @@ class BinanceClient:
             logger.info(f"Created spot {side} order for {symbol}: {amount} @ MARKET")
             return order
         except ccxt.InsufficientFunds as e:
-            logger.error(f"Insufficient funds for spot order on {symbol}: {str(e)}")
+            logger.error("Insufficient funds for spot order on {}: {}", symbol, e)
             raise
         except ccxt.InvalidOrder as e:
-            logger.error(f"Invalid spot order for {symbol}: {str(e)}")
+            logger.error("Invalid spot order for {}: {}", symbol, e)
             raise
         except Exception as e:
-            logger.error(f"Error creating spot order for {symbol}: {str(e)}")
+            logger.opt(exception=e).error("Error creating spot order for {}", symbol)
             raise
             
-    def create_futures_order(self, symbol: str, order_type: str, side: str, 
+    async def create_futures_order(self, symbol: str, order_type: str, side: str, 
                            amount: float, price: Optional[float] = None) -> Dict:
         """Create a futures order."""
         try:
             # Validate amount
-            if amount < TRADING_CONFIG['MIN_POSITION_SIZE']:
-                raise ValueError(f"Order amount {amount} is below minimum {TRADING_CONFIG['MIN_POSITION_SIZE']}")
-            if amount > TRADING_CONFIG['MAX_POSITION_SIZE']:
-                raise ValueError(f"Order amount {amount} exceeds maximum {TRADING_CONFIG['MAX_POSITION_SIZE']}")
+            if amount < TRADING_CONFIG.MIN_POSITION_SIZE:
+                raise ValueError(f"Order amount {amount} is below minimum {TRADING_CONFIG.MIN_POSITION_SIZE}")
+            if amount > TRADING_CONFIG.MAX_POSITION_SIZE:
+                raise ValueError(f"Order amount {amount} exceeds maximum {TRADING_CONFIG.MAX_POSITION_SIZE}")
                 
             # Always use market orders for futures to ensure reliable execution
-            order = self.futures.create_order(
+            order = await self._call(
+                self.futures.create_order,
                 symbol=symbol,
                 type='MARKET',
                 side=side,
@@ -159,139 +511,191 @@ class BinanceClient:
             logger.info(f"Created futures {side} order for {symbol}: {amount} @ MARKET")
             return order
         except ccxt.InsufficientFunds as e:
-            logger.error(f"Insufficient funds for futures order on {symbol}: {str(e)}")
+            logger.error("Insufficient funds for futures order on {}: {}", symbol, e)
             raise
         except ccxt.InvalidOrder as e:
-            logger.error(f"Invalid futures order for {symbol}: {str(e)}")
+            logger.error("Invalid futures order for {}: {}", symbol, e)
             raise
         except Exception as e:
-            logger.error(f"Error creating futures order for {symbol}: {str(e)}")
+            logger.opt(exception=e).error("Error creating futures order for {}", symbol)
             raise
             
-    def get_balance(self, currency: str = 'USDT') -> float:
+    async def get_balance(self, currency: str = 'USDT') -> float:
         """Get the balance for a specific currency."""
         try:
-            balance = self.spot.fetch_balance()
+            balance = await self._call(self.spot.fetch_balance)
             return float(balance.get(currency, {}).get('free', 0))
         except Exception as e:
-            logger.error(f"Error fetching balance for {currency}: {str(e)}")
+            logger.opt(exception=e).error("Error fetching balance for {}", currency)
             return 0.0
             
-    def set_leverage(self, symbol: str, leverage: int) -> bool:
+    async def set_leverage(self, symbol: str, leverage: int) -> bool:
         """Set the leverage for a symbol."""
         try:
-            self.futures.set_leverage(leverage, symbol)
+            await self._call(self.futures.set_leverage, leverage, symbol)
             return True
         except Exception as e:
-            logger.error(f"Error setting leverage for {symbol}: {str(e)}")
+            logger.opt(exception=e).error("Error setting leverage for {}", symbol)
             return False
             
-    def get_position(self, symbol: str) -> Dict:
-        """Get the current position for a symbol."""
+    async def get_positions(self) -> Dict[str, Dict]:
+        """Get all open futures positions keyed by exchange symbol.
+        
+        Binance returns every position regardless of any symbol filter, so one
+        snapshot serves all symbols.
+        """
         try:
-            positions = self.futures.fetch_positions([symbol])
-            return positions[0] if positions else {}
+            positions = await self._call(self.futures.fetch_positions)
+            return {
+                position['info']['symbol']: position
+                for position in positions
+                if float(position.get('contracts') or 0) > 0
+            }
         except Exception as e:
-            logger.error(f"Error fetching position for {symbol}: {str(e)}")
+            logger.opt(exception=e).error("Error fetching positions")
             return {}
             
-    def check_liquidity(self, symbol: str, min_liquidity: float = None) -> bool:
+    async def check_liquidity(self, symbol: str, min_liquidity: float = None) -> bool:
         """Check if there's sufficient liquidity for trading."""
         if min_liquidity is None:
-            min_liquidity = TRADING_CONFIG['MIN_LIQUIDITY']
+            min_liquidity = TRADING_CONFIG.MIN_LIQUIDITY
             
-        order_book = self.get_order_book(symbol)
+        order_book = await self.get_order_book(symbol)
         bids = order_book.get('bids', [])
         asks = order_book.get('asks', [])
         
         if not bids or not asks:
             return False
             
-        bid_liquidity = sum(float(bid[1]) for bid in bids[:10])
-        ask_liquidity = sum(float(ask[1]) for ask in asks[:10])
+        return _has_depth(bids, min_liquidity) and _has_depth(asks, min_liquidity)
         
-        return min(bid_liquidity, ask_liquidity) >= min_liquidity
+    async def get_funding_rate_history(self, symbol: str, limit: int = 10) -> List[Dict]:
+        """Get historical funding rates for a symbol.
         
-    def get_funding_rate_history(self, symbol: str, limit: int = 10) -> List[Dict]:
-        """Get historical funding rates for a symbol."""
+        Cached history is returned immediately; once it is older than a funding
+        period it is still served while a background task fetches a fresh copy.
+        """
+        key = (symbol, limit)
+        cached = self._fr_history_cache.get(key)
+        if cached is None:
+            return await self._refresh_funding_rate_history(symbol, limit)
+            
+        fetched_at, history = cached
+        if time.monotonic() - fetched_at >= _FR_HISTORY_TTL and key not in self._fr_history_refreshing:
+            task = asyncio.create_task(self._refresh_funding_rate_history(symbol, limit))
+            self._fr_history_refreshing[key] = task
+            task.add_done_callback(lambda _: self._fr_history_refreshing.pop(key, None))
+        return history
+        
+    async def _refresh_funding_rate_history(self, symbol: str, limit: int) -> List[Dict]:
+        """Fetch funding rate history from the exchange and update the cache."""
         try:
-            return self.futures.fetch_funding_rate_history(symbol, limit=limit)
+            history = await self._call(self.futures.fetch_funding_rate_history, symbol, limit=limit)
         except Exception as e:
-            logger.error(f"Error fetching funding rate history for {symbol}: {str(e)}")
+            logger.opt(exception=e).error("Error fetching funding rate history for {}", symbol)
             return []
+        if history:
+            self._fr_history_cache[(symbol, limit)] = (time.monotonic(), history)
+        return history
             
-    def calculate_profitability_analysis(self, symbol: str, position_size: float) -> Dict:
+    async def calculate_profitability_analysis(self, symbol: str, position_size: float) -> Dict:
         """Calculate detailed profitability analysis for a position."""
+        return (await self.calculate_profitability_analysis_batch([symbol], [position_size]))[symbol]
+        
+    async def calculate_profitability_analysis_batch(self, symbols: Sequence[str],
+                                                     position_sizes: Sequence[float]) -> Dict[str, Dict]:
+        """Calculate profitability analyses for several symbols in one vectorized pass.
+        
+        Histories are fetched concurrently and stacked into one matrix (padded
+        with NaN where a history is shorter) and handed to one profitability
+        kernel covering all symbols. Analyses whose history is unchanged
+        are served from the per-symbol memo.
+        """
+        results: Dict[str, Dict] = {}
         try:
-            # Get historical funding rates
-            history = self.get_funding_rate_history(symbol, limit=30)  # Last 30 periods
-            if not history:
-                return {
-                    'error': 'No funding rate history available',
-                    'profitable': False
+            # Get historical funding rates (last 30 periods)
+            histories = await asyncio.gather(*(self.get_funding_rate_history(symbol, limit=30) for symbol in symbols))
+            
+            pending = []
+            for symbol, position_size, history in zip(symbols, position_sizes, histories):
+                if not history:
+                    results[symbol] = {
+                        'error': 'No funding rate history available',
+                        'profitable': False
+                    }
+                    continue
+                # Reuse the analysis while the underlying history is unchanged
+                cached_history, analyses = self._analysis_cache.get(symbol, (None, {}))
+                if cached_history is not history:
+                    analyses = {}
+                    self._analysis_cache[symbol] = (history, analyses)
+                elif position_size in analyses:
+                    results[symbol] = analyses[position_size]
+                    continue
+                pending.append((symbol, position_size, history, analyses))
+            if not pending:
+                return results
+                
+            # Stack the histories row by row
+            width = max(len(history) for _, _, history, _ in pending)
+            rates = np.full((len(pending), width), np.nan)
+            lengths = np.empty(len(pending), dtype=np.int64)
+            for row, (_, _, history, _) in enumerate(pending):
+                rates[row, :len(history)] = [rate['fundingRate'] for rate in history]
+                lengths[row] = len(history)
+            sizes = np.array([position_size for _, position_size, _, _ in pending], dtype=np.float64)
+            
+            columns = _profitability_core(rates, lengths, sizes)
+            
+            for row, (symbol, position_size, _, analyses) in enumerate(pending):
+                avg_rate, min_rate, total_fees, expected_funding_profit, payments_to_breakeven, \
+                    worst_case_profit, worst_case_net = columns[row].tolist()
+                analysis = {
+                    'position_size': position_size,
+                    'avg_funding_rate': avg_rate,
+                    'min_funding_rate': min_rate,
+                    'expected_payments': _EXPECTED_PAYMENTS,
+                    'expected_funding_profit': expected_funding_profit,
+                    'total_fees': total_fees,
+                    'net_profit': expected_funding_profit - total_fees,
+                    'break_even_rate': BREAK_EVEN_RATE,
+                    'payments_to_breakeven': payments_to_breakeven,
+                    'worst_case_profit': worst_case_profit,
+                    'worst_case_net': worst_case_net,
+                    'profitable': worst_case_net > 0,  # Only profitable if we can break even in worst case
+                    'days_to_hold': _DAYS_TO_HOLD
                 }
-            
-            # Calculate average and min funding rates
-            rates = [float(rate['fundingRate']) for rate in history]
-            avg_rate = sum(rates) / len(rates)
-            min_rate = min(rates)
-            
-            # Calculate expected funding payments
-            days_to_hold = TRADING_CONFIG['MAX_POSITION_DURATION'] / (24 * 3600)
-            expected_payments = days_to_hold * 3  # 3 payments per day
-            
-            # Calculate trading fees
-            spot_fee = 0.00075  # 0.075% with BNB
-            futures_fee = 0.0004  # 0.04% taker fee
-            total_fees = position_size * (spot_fee + futures_fee) * 2  # *2 for entry and exit
-            
-            # Calculate break-even funding rate
-            break_even_rate = total_fees / (position_size * expected_payments)
-            
-            # Calculate worst-case scenario (funding rate rises after 1 payment)
-            worst_case_payments = 1
-            worst_case_profit = position_size * abs(min_rate) * worst_case_payments
-            worst_case_net = worst_case_profit - total_fees
-            
-            # Calculate how many payments needed to break even
-            payments_to_breakeven = total_fees / (position_size * abs(min_rate))
-            
-            return {
-                'position_size': position_size,
-                'avg_funding_rate': avg_rate,
-                'min_funding_rate': min_rate,
-                'expected_payments': expected_payments,
-                'expected_funding_profit': position_size * abs(min_rate) * expected_payments,
-                'total_fees': total_fees,
-                'break_even_rate': break_even_rate,
-                'payments_to_breakeven': payments_to_breakeven,
-                'worst_case_profit': worst_case_profit,
-                'worst_case_net': worst_case_net,
-                'profitable': worst_case_net > 0,  # Only profitable if we can break even in worst case
-                'days_to_hold': days_to_hold
-            }
+                analyses[position_size] = analysis
+                results[symbol] = analysis
+            return results
             
         except Exception as e:
-            logger.error(f"Error calculating profitability analysis: {str(e)}")
-            return {
+            logger.opt(exception=e).error("Error calculating profitability analysis")
+            error = {
                 'error': str(e),
                 'profitable': False
             }
+            return {symbol: results.get(symbol, error) for symbol in symbols}
             
-    def should_exit_position(self, symbol: str, position: Dict) -> bool:
-        """Determine if we should exit a position based on current conditions."""
+    async def should_exit_position(self, symbol: str, position: Dict,
+                                   current_rate: Optional[float] = None) -> bool:
+        """Determine if we should exit a position based on current conditions.
+        
+        Callers that already hold a fresh funding rate pass it as current_rate
+        to skip the lookup.
+        """
         try:
-            current_rate = self.get_funding_rate(symbol)
+            if current_rate is None:
+                current_rate = await self.get_funding_rate(symbol)
             entry_rate = position['entry_rate']
             entry_time = position['entry_time']
             current_time = time.time()
             
             # Get profitability analysis
-            analysis = self.calculate_profitability_analysis(symbol, position['spot_size'])
+            analysis = await self.calculate_profitability_analysis(symbol, position['spot_size'])
             
             # Calculate how many funding payments we've received
-            hours_held = (current_time - entry_time) / 3600
-            payments_received = int(hours_held / 8)  # Funding payments every 8 hours
+            payments_received = int(current_time - entry_time) // _FUNDING_PERIOD_SEC
             
             # Calculate current profit
             current_profit = position['spot_size'] * abs(entry_rate) * payments_received
@@ -308,15 +712,15 @@ class BinanceClient:
             return False
             
         except Exception as e:
-            logger.error(f"Error checking exit conditions: {str(e)}")
+            logger.opt(exception=e).error("Error checking exit conditions")
             return False
             
-    def calculate_expected_profit(self, symbol: str, position_size: float, 
+    async def calculate_expected_profit(self, symbol: str, position_size: float, 
                                 current_rate: float) -> float:
         """Calculate expected profit from funding rate payments."""
         try:
-            analysis = self.calculate_profitability_analysis(symbol, position_size)
+            analysis = await self.calculate_profitability_analysis(symbol, position_size)
             return analysis.get('net_profit', 0.0)
         except Exception as e:
-            logger.error(f"Error calculating expected profit for {symbol}: {str(e)}")
+            logger.opt(exception=e).error("Error calculating expected profit for {}", symbol)
             return 0.0 
\ No newline at end of file
@@ -1,10 +1,14 @@
+import asyncio
+import numpy as np
+from dataclasses import dataclass
 import time
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+from datetime import datetime
 from loguru import logger
 import sys
 import signal
-import json
+import sqlite3
+import orjson
 from pathlib import Path
 
 from config import (
@@ -12,30 +16,157 @@ from config import (
     TRADING_PAIRS, RISK_CONFIG, LOG_CONFIG,
     PAPER_TRADING, PAPER_TRADING_BALANCE
 )
-from exchange_clients import BinanceClient
+from exchange_clients import BinanceClient, BREAK_EVEN_RATE
 from paper_trading import PaperTradingClient
-from trading_reports import TradingReports
+from trading_reports import TradingReports, TradeRecord
 
+STATE_DB = Path("bot_state.db")
+STATE_FILE = Path("bot_state.json")  # Legacy snapshot, imported once if no database exists yet
+
+# Positions are closed once funding is no more negative than this (-0.005%)
+_NORMALIZED_RATE = -0.00005
+
+# Shorts receive funding when the rate is negative, so an entry needs a rate at or below both the
+# configured minimum and -break_even (fee-derived, the same for every symbol and position size)
+_ENTRY_THRESHOLD = min(TRADING_CONFIG.MIN_FUNDING_RATE, -BREAK_EVEN_RATE)
+
+# Risk limits read on every evaluation, bound once at import
+_MAX_OPEN_POSITIONS = RISK_CONFIG['MAX_OPEN_POSITIONS']
+_MAX_DAILY_TRADES = RISK_CONFIG['MAX_DAILY_TRADES']
+_MAX_DRAWDOWN = RISK_CONFIG['MAX_DRAWDOWN']
+
+class StateStore:
+    """SQLite (WAL) store for bot state: one row per open position plus a few scalars."""
+    
+    def __init__(self, path: Path):
+        self.db = sqlite3.connect(path, isolation_level=None)  # Autocommit; transactions are explicit
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS positions (symbol TEXT PRIMARY KEY, data BLOB NOT NULL)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v)")
+        
+    def load(self) -> Tuple[Dict[str, Dict], Dict]:
+        """Return all stored positions and scalars."""
+        positions = {symbol: orjson.loads(data) for symbol, data in self.db.execute("SELECT symbol, data FROM positions")}
+        meta = dict(self.db.execute("SELECT k, v FROM meta"))
+        return positions, meta
+        
+    def save(self, positions: Dict[str, Dict], changed: Sequence[str], meta: Dict, rewrite: bool = False):
+        """Upsert or delete the changed symbols (every row if rewrite) and the scalars in one transaction."""
+        with self.db:
+            self.db.execute("BEGIN")
+            if rewrite:
+                self.db.execute("DELETE FROM positions")
+                changed = list(positions)
+            for symbol in changed:
+                position = positions.get(symbol)
+                if position is None:
+                    self.db.execute("DELETE FROM positions WHERE symbol = ?", (symbol,))
+                else:
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO positions VALUES (?, ?)",
+                        (symbol, orjson.dumps(position, option=orjson.OPT_SERIALIZE_NUMPY))
+                    )
+            self.db.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", meta.items())
+            
+    def close(self):
+        self.db.close()
+        
+@dataclass(frozen=True, slots=True)
+class RiskSnapshot:
+    """Outcome of a risk check and the state it was computed from."""
+    ok: bool
+    balance: float = 0.0
+    drawdown: float = 0.0
+    positions: int = 0
+    daily_trades: int = 0
+    
+class PositionTable:
+    """Column view of open positions, one row per traded pair, for vectorized exit checks."""
+    
+    def __init__(self, symbols: Sequence[str]):
+        self.index = {symbol: row for row, symbol in enumerate(symbols)}
+        self.active = np.zeros(len(symbols), dtype=bool)
+        self.entry_time = np.zeros(len(symbols))
+        
+    def set(self, symbol: str, position: Dict):
+        """Mark symbol as open; pairs outside the table are ignored."""
+        row = self.index.get(symbol)
+        if row is not None:
+            self.active[row] = True
+            self.entry_time[row] = position['entry_time']
+            
+    def drop(self, symbol: str):
+        """Mark symbol as closed."""
+        row = self.index.get(symbol)
+        if row is not None:
+            self.active[row] = False
+            
+    def reset(self, positions: Dict[str, Dict]):
+        """Rebuild the table from a positions dict."""
+        self.active[:] = False
+        for symbol, position in positions.items():
+            self.set(symbol, position)
+            
+    def normalized(self, rates: np.ndarray) -> np.ndarray:
+        """Rows of open positions whose funding rate has normalized."""
+        return self.active & (rates >= _NORMALIZED_RATE)
+        
+    def due(self, now: float, rates: np.ndarray) -> np.ndarray:
+        """Rows of open positions held too long or whose funding rate has normalized."""
+        return self.normalized(rates) | (
+            self.active & (now - self.entry_time > TRADING_CONFIG.MAX_POSITION_DURATION)
+        )
+        
 class FundingRateBot:
     def __init__(self):
+        # Initialize exchange client based on mode
+        if PAPER_TRADING:
+            logger.info(f"Initializing bot in PAPER TRADING mode with balance: {PAPER_TRADING_BALANCE} USDT")
+            self.binance = PaperTradingClient(initial_balance=PAPER_TRADING_BALANCE)
+        else:
+            logger.info("Initializing bot in LIVE TRADING mode")
+            self.binance = BinanceClient()
+        
+        # Initialize state. active_positions is never mutated in place: writers rebind it to a
+        # new dict, so readers can iterate the reference they hold while other tasks open or close.
+        self.active_positions: Dict[str, Dict] = {}
+        self.daily_trades = 0
+        self._daily_reset_monotonic = time.monotonic()
+        self.initial_balance = 0.0
+        self._balance_cache = (0.0, 0.0)  # (balance, monotonic expiry)
+        self._state_dirty = asyncio.Event()
+        self._state_store = StateStore(STATE_DB)
+        self._changed_symbols: set = set()  # Positions opened or closed since the last save
+        self._rewrite_positions = False  # Whole book replaced since the last save
+        
+        # Streamed opportunities: one evaluation at a time, each symbol at most once per check interval
+        self._trade_lock = asyncio.Lock()
+        self._last_evaluated: Dict[str, float] = {}
+        self._pending_evaluations: Dict[str, asyncio.Task] = {}
+        self._shutting_down = False  # Set first thing in _shutdown; no new evaluation starts after that
+        
+        # Latest funding rate per traded pair, and which pairs are at or below the entry threshold
+        self._symbol_idx = {symbol: idx for idx, symbol in enumerate(TRADING_PAIRS)}
+        self._last_rate = np.full(len(TRADING_PAIRS), np.nan)
+        self._interesting = np.zeros(len(TRADING_PAIRS), dtype=np.uint8)
+        
+        # Column mirror of active_positions for vectorized exit checks, indexed like TRADING_PAIRS
+        self._position_table = PositionTable(TRADING_PAIRS)
+        
+        # Set by the funding stream when an open position's rate normalizes, to cut the monitor's sleep short
+        self._monitor_wakeup = asyncio.Event()
+        self._normalized = np.zeros(len(TRADING_PAIRS), dtype=bool)
+
+    async def initialize(self):
+        """Connect to the exchange and restore state."""
         try:
-            # Initialize exchange client based on mode
-            if PAPER_TRADING:
-                logger.info(f"Initializing bot in PAPER TRADING mode with balance: {PAPER_TRADING_BALANCE} USDT")
-                self.binance = PaperTradingClient(initial_balance=PAPER_TRADING_BALANCE)
-            else:
-                logger.info("Initializing bot in LIVE TRADING mode")
-                self.binance = BinanceClient()
-            
-            # Initialize state
-            self.active_positions: Dict[str, Dict] = {}
-            self.last_check = 0
-            self.daily_trades = 0
-            self.daily_trades_reset = datetime.now()
-            self.initial_balance = self.binance.get_balance()
-            
-            if self.initial_balance < TRADING_CONFIG['MIN_POSITION_SIZE']:
-                raise ValueError(f"Initial balance {self.initial_balance} USDT is below minimum position size {TRADING_CONFIG['MIN_POSITION_SIZE']} USDT")
+            await self.binance.connect()
+            await self.binance.start_streams(TRADING_PAIRS)
+            self.initial_balance = await self.binance.get_balance()
+            
+            if self.initial_balance < TRADING_CONFIG.MIN_POSITION_SIZE:
+                raise ValueError(f"Initial balance {self.initial_balance} USDT is below minimum position size {TRADING_CONFIG.MIN_POSITION_SIZE} USDT")
             
             # Setup logging
             self._setup_logging()
@@ -45,436 +176,694 @@ class FundingRateBot:
             self.reports.set_initial_balance(self.initial_balance)
             
             # Load state if exists
-            self._load_state()
+            await self._load_state()
+            
+            # React to pushed funding rates instead of waiting for the next scan
+            self.binance.add_funding_listener(self._on_funding_update)
             
             logger.info(f"Bot initialized with balance: {self.initial_balance:.2f} USDT")
             
         except Exception as e:
             logger.error(f"Failed to initialize bot: {str(e)}")
+            await self.binance.close()
             raise
             
     def _setup_logging(self):
         """Setup logging configuration."""
         try:
             logger.remove()  # Remove default handler
+            # enqueue=True hands records to a writer thread so the event loop never blocks on I/O
             logger.add(
                 sys.stdout,
                 format=LOG_CONFIG['LOG_FORMAT'],
-                level=LOG_CONFIG['LOG_LEVEL']
+                level=LOG_CONFIG['LOG_LEVEL'],
+                enqueue=True
             )
             logger.add(
                 LOG_CONFIG['LOG_FILE'],
                 format=LOG_CONFIG['LOG_FORMAT'],
                 level=LOG_CONFIG['LOG_LEVEL'],
-                rotation="1 day"
+                rotation="1 day",
+                compression="gz",  # Rotated files are compressed on the writer thread
+                enqueue=True
             )
             logger.info("Logging setup completed")
         except Exception as e:
             logger.error(f"Failed to setup logging: {str(e)}")
             raise
             
-    def _load_state(self):
-        """Load bot state from file if exists."""
-        state_file = Path("bot_state.json")
-        if state_file.exists():
-            try:
-                with open(state_file, 'r') as f:
-                    state = json.load(f)
-                    # Load positions but validate them
-                    loaded_positions = state.get('active_positions', {})
-                    self.active_positions = {}
-                    
-                    # Validate each position and enforce limit
-                    valid_positions = 0
-                    for symbol, position in loaded_positions.items():
-                        # Check if we've hit the position limit
-                        if valid_positions >= RISK_CONFIG['MAX_OPEN_POSITIONS']:
-                            logger.warning(f"Position limit reached during state load, skipping {symbol}")
-                            continue
-                            
-                        # Check if position still exists in exchange
-                        current_position = self.binance.get_position(symbol)
-                        if current_position and current_position.get('size', 0) > 0:
-                            self.active_positions[symbol] = position
-                            valid_positions += 1
-                        else:
-                            logger.warning(f"Removing invalid position for {symbol} during state load")
-                    
-                    self.daily_trades = state.get('daily_trades', 0)
-                    self.daily_trades_reset = datetime.fromisoformat(
-                        state.get('daily_trades_reset', datetime.now().isoformat())
-                    )
-                logger.info(f"Loaded state: {len(self.active_positions)} active positions, {self.daily_trades} daily trades")
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid state file format: {str(e)}")
-                self._reset_state()
-            except Exception as e:
-                logger.error(f"Error loading state: {str(e)}")
+    async def _load_state(self):
+        """Load bot state from the state database, or the legacy JSON file, if any."""
+        try:
+            loaded_positions, state = self._state_store.load()
+            if not state and STATE_FILE.exists():
+                state = orjson.loads(STATE_FILE.read_bytes())
+                loaded_positions = state.get('active_positions', {})
+            if not state:
                 self._reset_state()
-        else:
-            # If bot_state.json does not exist, reset state to empty
+                return
+                
+            # Validate each position against one exchange snapshot and enforce limit
+            active_positions = {}
+            exchange_positions = await self.binance.get_positions()
+            valid_positions = 0
+            for symbol, position in loaded_positions.items():
+                # Check if we've hit the position limit
+                if valid_positions >= _MAX_OPEN_POSITIONS:
+                    logger.warning(f"Position limit reached during state load, skipping {symbol}")
+                    continue
+                    
+                # Check if the futures leg still exists on the exchange; a position whose futures leg was
+                # already closed (spot leg left from a partial close) cannot be checked against this snapshot
+                current_position = exchange_positions.get(symbol, {})
+                if float(current_position.get('contracts') or 0) > 0 or position['futures_size'] <= 0:
+                    if 'spot_order' in position:  # Saved before only entry prices were kept
+                        position['spot_entry_price'] = position.pop('spot_order')['price']
+                        position['futures_entry_price'] = position.pop('futures_order')['price']
+                    active_positions[symbol] = position
+                    valid_positions += 1
+                else:
+                    logger.warning(f"Removing invalid position for {symbol} during state load")
+            self._replace_positions(active_positions)
+            
+            self.daily_trades = state.get('daily_trades', 0)
+            reset_at = state.get('daily_trades_reset', time.time())
+            if isinstance(reset_at, str):  # State files written before the reset was stored as a timestamp
+                reset_at = datetime.fromisoformat(reset_at).timestamp()
+            self._daily_reset_monotonic = time.monotonic() - (time.time() - reset_at)
+            logger.info(f"Loaded state: {len(self.active_positions)} active positions, {self.daily_trades} daily trades")
+            self._mark_state_dirty()
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Invalid state format: {str(e)}")
+            self._reset_state()
+        except Exception as e:
+            logger.opt(exception=e).error("Error loading state")
             self._reset_state()
                 
     def _reset_state(self):
         """Reset bot state to initial values."""
-        self.active_positions = {}
+        self._replace_positions({})
         self.daily_trades = 0
-        self.daily_trades_reset = datetime.now()
+        self._daily_reset_monotonic = time.monotonic()
         logger.info("Bot state reset to initial values")
                 
+    def _replace_positions(self, positions: Dict[str, Dict]):
+        """Publish a whole new positions dict and rebuild its column mirror."""
+        self.active_positions = positions
+        self._position_table.reset(positions)
+        self._rewrite_positions = True
+        
+    def _set_position(self, symbol: str, position: Dict):
+        """Publish a new positions dict that includes symbol."""
+        self.active_positions = {**self.active_positions, symbol: position}
+        self._position_table.set(symbol, position)
+        self._changed_symbols.add(symbol)
+        
+    def _drop_position(self, symbol: str):
+        """Publish a new positions dict without symbol."""
+        positions = dict(self.active_positions)
+        positions.pop(symbol, None)
+        self.active_positions = positions
+        self._position_table.drop(symbol)
+        self._changed_symbols.add(symbol)
+        
     def _save_state(self):
-        """Save bot state to file."""
+        """Persist positions opened or closed since the last save, plus the daily counters."""
+        changed, rewrite = self._changed_symbols, self._rewrite_positions
+        self._changed_symbols, self._rewrite_positions = set(), False
         try:
-            state = {
-                'active_positions': self.active_positions,
-                'daily_trades': self.daily_trades,
-                'daily_trades_reset': self.daily_trades_reset.isoformat()
-            }
-            with open("bot_state.json", 'w') as f:
-                json.dump(state, f)
+            self._state_store.save(
+                self.active_positions,
+                list(changed),
+                {
+                    'daily_trades': self.daily_trades,
+                    'daily_trades_reset': time.time() - (time.monotonic() - self._daily_reset_monotonic)
+                },
+                rewrite=rewrite
+            )
             logger.debug("Bot state saved successfully")
         except Exception as e:
-            logger.error(f"Error saving state: {str(e)}")
+            # Keep the pending changes so the next save retries them
+            self._changed_symbols |= changed
+            self._rewrite_positions |= rewrite
+            self._state_dirty.set()
+            logger.opt(exception=e).error("Error saving state")
+            
+    def _mark_state_dirty(self):
+        """Schedule a state save; bursts of changes are coalesced into one write."""
+        self._state_dirty.set()
+        
+    async def _state_writer(self):
+        """Persist state shortly after it changes, at most once per STATE_SAVE_INTERVAL."""
+        while True:
+            await self._state_dirty.wait()
+            await asyncio.sleep(MONITORING_CONFIG['STATE_SAVE_DELAY'])
+            self._state_dirty.clear()
+            self._save_state()
+            self.reports.flush()  # Trades open or close with position changes, so this bounds how far metrics lag
+            # Changes made meanwhile stay flagged and go out with the next write
+            await asyncio.sleep(MONITORING_CONFIG['STATE_SAVE_INTERVAL'])
             
-    def check_risk_limits(self) -> bool:
+    async def _cached_balance(self, ttl: float = MONITORING_CONFIG['BALANCE_CACHE_TTL']) -> float:
+        """Return the USDT balance, reusing the last fetch until it expires or an order is placed."""
+        balance, expiry = self._balance_cache
+        now = time.monotonic()
+        if now < expiry:
+            return balance
+        balance = await self.binance.get_balance()
+        self._balance_cache = (balance, now + ttl)
+        return balance
+        
+    def _invalidate_balance(self):
+        """Force the next balance read to hit the exchange."""
+        self._balance_cache = (self._balance_cache[0], 0.0)
+        
+    async def check_risk_limits(self) -> RiskSnapshot:
         """Check if we're within risk limits."""
         try:
             # Reset daily trades counter if needed
-            if datetime.now() - self.daily_trades_reset > timedelta(days=1):
+            now = time.monotonic()
+            if now - self._daily_reset_monotonic > 86400:
                 self.daily_trades = 0
-                self.daily_trades_reset = datetime.now()
+                self._daily_reset_monotonic = now
                 logger.info("Daily trades counter reset")
                 
             # Check maximum open positions
             current_positions = len(self.active_positions)
-            if current_positions >= RISK_CONFIG['MAX_OPEN_POSITIONS']:
-                logger.warning(f"Maximum number of open positions reached ({current_positions}/{RISK_CONFIG['MAX_OPEN_POSITIONS']})")
-                return False
+            if current_positions >= _MAX_OPEN_POSITIONS:
+                logger.warning(f"Maximum number of open positions reached ({current_positions}/{_MAX_OPEN_POSITIONS})")
+                return RiskSnapshot(False, positions=current_positions, daily_trades=self.daily_trades)
                 
             # Check daily trade limit
-            if self.daily_trades >= RISK_CONFIG['MAX_DAILY_TRADES']:
-                logger.warning(f"Maximum daily trades reached ({self.daily_trades}/{RISK_CONFIG['MAX_DAILY_TRADES']})")
-                return False
+            if self.daily_trades >= _MAX_DAILY_TRADES:
+                logger.warning(f"Maximum daily trades reached ({self.daily_trades}/{_MAX_DAILY_TRADES})")
+                return RiskSnapshot(False, positions=current_positions, daily_trades=self.daily_trades)
                 
             # Check drawdown
-            current_balance = self.binance.get_balance()
+            current_balance = await self._cached_balance()
             drawdown = (self.initial_balance - current_balance) / self.initial_balance
-            if drawdown >= RISK_CONFIG['MAX_DRAWDOWN']:
-                logger.warning(f"Maximum drawdown reached: {drawdown:.2%} (limit: {RISK_CONFIG['MAX_DRAWDOWN']:.2%})")
-                return False
+            if drawdown >= _MAX_DRAWDOWN:
+                logger.warning(f"Maximum drawdown reached: {drawdown:.2%} (limit: {_MAX_DRAWDOWN:.2%})")
                 
-            return True
+            return RiskSnapshot(drawdown < _MAX_DRAWDOWN, current_balance, drawdown,
+                                current_positions, self.daily_trades)
             
         except Exception as e:
-            logger.error(f"Error checking risk limits: {str(e)}")
-            return False
+            logger.opt(exception=e).error("Error checking risk limits")
+            return RiskSnapshot(False)
+            
+    def _risk_still_valid(self, snapshot: RiskSnapshot) -> bool:
+        """Whether snapshot still describes the current state, i.e. nothing opened or closed since."""
+        return (snapshot.positions == len(self.active_positions)
+                and snapshot.daily_trades == self.daily_trades)
             
-    def check_opportunities(self):
+    async def check_opportunities(self):
         """Check for funding rate arbitrage opportunities."""
         try:
-            current_time = time.time()
-            if current_time - self.last_check < MONITORING_CONFIG['CHECK_INTERVAL']:
-                return
-                
-            self.last_check = current_time
-            
             # Check risk limits before looking for opportunities
-            if not self.check_risk_limits():
+            risk = await self.check_risk_limits()
+            if not risk.ok:
                 return
                 
-            logger.info("\n=== Current Funding Rates ===")
+            # Fetch all funding rates in a single round-trip
+            funding_rates = await self.binance.get_all_funding_rates(TRADING_PAIRS)
+                
+            self._record_rates(funding_rates)
+                
             for symbol in TRADING_PAIRS:
+                if symbol not in funding_rates:
+                    logger.error(f"Error checking {symbol}: no funding rate available")
+            # One lazily built message: skipped entirely when INFO is filtered out
+            logger.opt(lazy=True).info("{}", lambda: self._format_funding_rates(funding_rates))
+            
+            # Only symbols flagged below the threshold go on to the (REST-heavy) evaluation
+            candidates = [idx for idx in np.flatnonzero(self._interesting) if self._can_evaluate(TRADING_PAIRS[idx])]
+            if len(candidates) > 1:
+                # Analyse every candidate in one batch; evaluate_trade then hits the memo
+                position_size = self._position_size(risk.balance)
+                symbols = [TRADING_PAIRS[idx] for idx in candidates]
+                await self.binance.calculate_profitability_analysis_batch(symbols, [position_size] * len(symbols))
+            for idx in candidates:
+                symbol = TRADING_PAIRS[idx]
+                funding_rate = float(self._last_rate[idx])
                 try:
-                    # Get funding rate
-                    funding_rate = self.binance.get_funding_rate(symbol)
-                    status = "OPPORTUNITY" if funding_rate <= TRADING_CONFIG['MIN_FUNDING_RATE'] else "SKIP"
-                    logger.info(f"{symbol}: {funding_rate*100:.4f}% (threshold: {TRADING_CONFIG['MIN_FUNDING_RATE']*100:.4f}%) - {status}")
-                    
-                    # Check for opportunities
-                    if funding_rate <= TRADING_CONFIG['MIN_FUNDING_RATE']:
+                    async with self._trade_lock:
+                        if not self._can_evaluate(symbol):
+                            continue
+                        self._last_evaluated[symbol] = time.monotonic()
                         logger.info(f"Found opportunity for {symbol} with funding rate: {funding_rate*100:.4f}%")
-                        self.evaluate_trade(symbol, funding_rate)
-                        
+                        await self.evaluate_trade(symbol, funding_rate, risk)
                 except Exception as e:
-                    logger.error(f"Error checking {symbol}: {str(e)}")
-                    continue
-            logger.info("=== End of Funding Rates ===\n")
+                    logger.opt(exception=e).error("Error checking {}", symbol)
                     
         except Exception as e:
-            logger.error(f"Error checking opportunities: {str(e)}")
+            logger.opt(exception=e).error("Error checking opportunities")
+            
+    def _format_funding_rates(self, funding_rates: Dict[str, float]) -> str:
+        """Render the funding rate table logged on each scan."""
+        threshold = _ENTRY_THRESHOLD
+        lines = ["\n=== Current Funding Rates ==="]
+        for symbol in TRADING_PAIRS:
+            if symbol in funding_rates:
+                funding_rate = funding_rates[symbol]
+                status = "OPPORTUNITY" if funding_rate <= threshold else "SKIP"
+                lines.append(f"{symbol}: {funding_rate*100:.4f}% (threshold: {threshold*100:.4f}%) - {status}")
+        lines.append("=== End of Funding Rates ===\n")
+        return "\n".join(lines)
+            
+    def _record_rates(self, funding_rates: Dict[str, float]):
+        """Store the latest rate per traded pair and flag those that could be profitable."""
+        indices = [self._symbol_idx[symbol] for symbol in funding_rates if symbol in self._symbol_idx]
+        if not indices:
+            return
+        self._last_rate[indices] = [funding_rates[TRADING_PAIRS[idx]] for idx in indices]
+        self._interesting[indices] = self._last_rate[indices] <= _ENTRY_THRESHOLD
+            
+    def _on_funding_update(self, funding_rates: Dict[str, float]):
+        """Wake the monitor for newly normalized positions and schedule evaluations for new opportunities."""
+        if self._shutting_down:
+            return
+        self._record_rates(funding_rates)
+        
+        normalized = self._position_table.normalized(self._last_rate)
+        if (normalized & ~self._normalized).any():
+            self._monitor_wakeup.set()
+        self._normalized = normalized
+        
+        for idx in np.flatnonzero(self._interesting):
+            symbol = TRADING_PAIRS[idx]
+            funding_rate = float(self._last_rate[idx])
+            if symbol in self._pending_evaluations or not self._can_evaluate(symbol):
+                continue
+            self._pending_evaluations[symbol] = asyncio.create_task(self._evaluate_streamed(symbol, funding_rate))
+            
+    def _can_evaluate(self, symbol: str) -> bool:
+        """Whether symbol has no open position and was not evaluated within the last check interval.
+        
+        Shared by the periodic scan and the stream; callers hold _trade_lock when acting on it.
+        """
+        return (symbol not in self.active_positions
+                and time.monotonic() - self._last_evaluated.get(symbol, float('-inf')) >= MONITORING_CONFIG['CHECK_INTERVAL'])
+                
+    async def _evaluate_streamed(self, symbol: str, funding_rate: float):
+        """Evaluate an opportunity raised by the funding rate stream."""
+        try:
+            async with self._trade_lock:
+                if self._shutting_down or not self._can_evaluate(symbol):
+                    return
+                self._last_evaluated[symbol] = time.monotonic()
+                logger.info(f"Streamed opportunity for {symbol} with funding rate: {funding_rate*100:.4f}%")
+                await self.evaluate_trade(symbol, funding_rate)
+        finally:
+            self._pending_evaluations.pop(symbol, None)
             
-    def evaluate_trade(self, symbol: str, funding_rate: float):
-        """Evaluate and execute a trade if conditions are met."""
+    @staticmethod
+    def _position_size(usdt_balance: float) -> float:
+        """Position size for a given free USDT balance."""
+        return min(
+            usdt_balance * TRADING_CONFIG.MAX_POSITION_PERCENT,  # Percentage of balance
+            TRADING_CONFIG.MAX_POSITION_SIZE  # Absolute maximum
+        )
+        
+    async def evaluate_trade(self, symbol: str, funding_rate: float, risk: Optional[RiskSnapshot] = None):
+        """Evaluate and execute a trade if conditions are met.
+        
+        A risk snapshot from earlier in the same scan is reused as long as no
+        position has opened or closed since; otherwise the limits are checked again.
+        """
         try:
-            # Check risk limits again before executing trade
-            if not self.check_risk_limits():
+            if risk is None or not self._risk_still_valid(risk):
+                risk = await self.check_risk_limits()
+            if not risk.ok:
                 logger.warning(f"Skipping trade for {symbol} due to risk limits")
                 return
+            usdt_balance = risk.balance
                 
             # Check liquidity
-            if not self.binance.check_liquidity(symbol):
+            if not await self.binance.check_liquidity(symbol):
                 logger.warning(f"Insufficient liquidity for {symbol}")
                 return
                 
             # Calculate position size
-            usdt_balance = self.binance.get_balance()
-            position_size = min(
-                usdt_balance * TRADING_CONFIG['MAX_POSITION_PERCENT'],  # Percentage of balance
-                TRADING_CONFIG['MAX_POSITION_SIZE']  # Absolute maximum
-            )
+            position_size = self._position_size(usdt_balance)
             
-            if position_size < TRADING_CONFIG['MIN_POSITION_SIZE']:
+            if position_size < TRADING_CONFIG.MIN_POSITION_SIZE:
                 logger.warning(f"Position size too small for {symbol}: {position_size:.2f} USDT")
                 return
                 
             # Calculate profitability analysis
-            analysis = self.binance.calculate_profitability_analysis(symbol, position_size)
+            analysis = await self.binance.calculate_profitability_analysis(symbol, position_size)
             
             if not analysis.get('profitable', False):
-                logger.warning(f"Trade not profitable for {symbol}")
-                logger.warning(f"Break-even funding rate: {analysis.get('break_even_rate', 0)*100:.4f}%")
-                logger.warning(f"Current funding rate: {funding_rate*100:.4f}%")
-                logger.warning(f"Payments needed to break even: {analysis.get('payments_to_breakeven', 0):.1f}")
+                logger.warning(
+                    "Trade not profitable for {}\n"
+                    "Break-even funding rate: {:.4f}%\n"
+                    "Current funding rate: {:.4f}%\n"
+                    "Payments needed to break even: {:.1f}",
+                    symbol,
+                    analysis.get('break_even_rate', 0)*100,
+                    funding_rate*100,
+                    analysis.get('payments_to_breakeven', 0)
+                )
                 return
                 
-            # Log profitability details
-            logger.info(f"Profitability analysis for {symbol}:")
-            logger.info(f"Position size: ${position_size:.2f}")
-            logger.info(f"Average funding rate: {analysis['avg_funding_rate']*100:.4f}%")
-            logger.info(f"Minimum funding rate: {analysis['min_funding_rate']*100:.4f}%")
-            logger.info(f"Expected funding payments: {analysis['expected_payments']}")
-            logger.info(f"Expected funding profit: ${analysis['expected_funding_profit']:.2f}")
-            logger.info(f"Total fees: ${analysis['total_fees']:.2f}")
-            logger.info(f"Payments needed to break even: {analysis['payments_to_breakeven']:.1f}")
-            logger.info(f"Worst-case profit: ${analysis['worst_case_profit']:.2f}")
-            logger.info(f"Worst-case net: ${analysis['worst_case_net']:.2f}")
-            logger.info(f"Days to hold: {analysis['days_to_hold']:.1f}")
+            # Log profitability details as one record, formatted only if INFO is enabled
+            logger.info(
+                "Profitability analysis for {}:\n"
+                "Position size: ${:.2f}\n"
+                "Average funding rate: {:.4f}%\n"
+                "Minimum funding rate: {:.4f}%\n"
+                "Expected funding payments: {}\n"
+                "Expected funding profit: ${:.2f}\n"
+                "Total fees: ${:.2f}\n"
+                "Payments needed to break even: {:.1f}\n"
+                "Worst-case profit: ${:.2f}\n"
+                "Worst-case net: ${:.2f}\n"
+                "Days to hold: {:.1f}",
+                symbol,
+                position_size,
+                analysis['avg_funding_rate']*100,
+                analysis['min_funding_rate']*100,
+                analysis['expected_payments'],
+                analysis['expected_funding_profit'],
+                analysis['total_fees'],
+                analysis['payments_to_breakeven'],
+                analysis['worst_case_profit'],
+                analysis['worst_case_net'],
+                analysis['days_to_hold']
+            )
                 
             # Execute the trade
-            self.execute_arbitrage(symbol, funding_rate, position_size)
+            await self.execute_arbitrage(symbol, funding_rate, position_size)
             
         except Exception as e:
-            logger.error(f"Error evaluating trade for {symbol}: {str(e)}")
+            logger.opt(exception=e).error("Error evaluating trade for {}", symbol)
             
-    def execute_arbitrage(self, symbol: str, funding_rate: float, size: float):
+    async def execute_arbitrage(self, symbol: str, funding_rate: float, size: float):
         """Execute the arbitrage trade."""
         try:
             # Set leverage
-            if not self.binance.set_leverage(symbol, TRADING_CONFIG['MAX_LEVERAGE']):
+            if not await self.binance.set_leverage(symbol, TRADING_CONFIG.MAX_LEVERAGE):
                 raise ValueError(f"Failed to set leverage for {symbol}")
             
             # Get current price for size conversion
-            price = self.binance.get_best_maker_price(symbol, 'BUY')
+            price = await self.binance.get_best_maker_price(symbol, 'BUY')
             asset_size = size / price  # Convert USDT size to asset size
             
-            # Open spot position (always market order)
-            spot_order = self.binance.create_spot_order(
-                symbol=symbol,
-                order_type='MARKET',
-                side='BUY',
-                amount=asset_size  # Use asset size instead of USDT size
+            # Open both legs concurrently to shrink the window in which price can move between them
+            spot_order, futures_order = await asyncio.gather(
+                # Spot leg (always market order)
+                self.binance.create_spot_order(
+                    symbol=symbol,
+                    order_type='MARKET',
+                    side='BUY',
+                    amount=asset_size  # Use asset size instead of USDT size
+                ),
+                # Futures leg (let exchange client decide based on price advantage)
+                self.binance.create_futures_order(
+                    symbol=symbol,
+                    order_type='MARKET',  # This will be overridden if limit order is possible
+                    side='SELL',
+                    amount=asset_size  # Use asset size instead of USDT size
+                ),
+                return_exceptions=True
             )
+            spot_filled = not isinstance(spot_order, BaseException)
+            futures_filled = not isinstance(futures_order, BaseException)
+            if spot_filled != futures_filled:
+                # Exactly one leg filled: reverse it from its own order rather than an exchange position
+                # snapshot, whose layout differs between the live and paper clients
+                if spot_filled:
+                    await self._reverse_leg(symbol, 'spot', spot_order)
+                    raise futures_order
+                await self._reverse_leg(symbol, 'futures', futures_order)
+                raise spot_order
+            if not spot_filled:
+                raise spot_order
             
             # Record spot trade
-            self.reports.record_trade({
-                'symbol': symbol,
-                'type': 'OPEN',
-                'side': 'BUY',
-                'amount': size,  # Keep USDT amount for reporting
-                'price': spot_order['price'],
-                'fees': spot_order['fee'],
-                'funding_rate': funding_rate
-            })
-            
-            # Open futures position (let exchange client decide based on price advantage)
-            futures_order = self.binance.create_futures_order(
+            self.reports.record_trade(TradeRecord(
                 symbol=symbol,
-                order_type='MARKET',  # This will be overridden if limit order is possible
-                side='SELL',
-                amount=asset_size  # Use asset size instead of USDT size
-            )
+                type='OPEN',
+                side='BUY',
+                amount=size,  # Keep USDT amount for reporting
+                price=spot_order['price'],
+                fees=spot_order['fee'],
+                funding_rate=funding_rate
+            ))
             
             # Record futures trade
-            self.reports.record_trade({
-                'symbol': symbol,
-                'type': 'OPEN',
-                'side': 'SELL',
-                'amount': size,  # Keep USDT amount for reporting
-                'price': futures_order['price'],
-                'fees': futures_order['fee'],
-                'funding_rate': funding_rate
-            })
+            self.reports.record_trade(TradeRecord(
+                symbol=symbol,
+                type='OPEN',
+                side='SELL',
+                amount=size,  # Keep USDT amount for reporting
+                price=futures_order['price'],
+                fees=futures_order['fee'],
+                funding_rate=funding_rate
+            ))
                 
             # Record the position
-            self.active_positions[symbol] = {
+            position = {
                 'spot_size': asset_size,  # Store in asset terms
                 'futures_size': asset_size,  # Store in asset terms
                 'entry_rate': funding_rate,
                 'entry_time': time.time(),
-                'spot_order': spot_order,
-                'futures_order': futures_order,
-                'expected_profit': self.binance.calculate_expected_profit(symbol, size, funding_rate)
+                'spot_entry_price': spot_order['price'],
+                'futures_entry_price': futures_order['price'],
+                'expected_profit': await self.binance.calculate_expected_profit(symbol, size, funding_rate)
             }
+            self._set_position(symbol, position)
             
             self.daily_trades += 1
-            self._save_state()
+            self._invalidate_balance()
+            self._mark_state_dirty()
             
             # Print live update with actual balance
-            self.reports.print_live_updates(self.binance.get_balance())
+            self.reports.print_live_updates(await self._cached_balance())
             
             logger.info(f"Opened position for {symbol}")
             logger.info(f"Funding rate: {funding_rate*100:.4f}%")
-            logger.info(f"Expected profit: {self.active_positions[symbol]['expected_profit']:.2f} USDT")
+            logger.info(f"Expected profit: {position['expected_profit']:.2f} USDT")
             
         except Exception as e:
             logger.error(f"Trade execution failed for {symbol}: {str(e)}")
-            # Try to close any partially opened positions
-            self._handle_failed_trade(symbol)
+            self._invalidate_balance()
             
-    def _handle_failed_trade(self, symbol: str):
-        """Handle a failed trade by closing any partially opened positions."""
+    async def _reverse_leg(self, symbol: str, leg: str, order: Dict):
+        """Send the opposite market order for a leg that filled while the other one failed."""
+        side = 'SELL' if str(order['side']).upper() == 'BUY' else 'BUY'
+        amount = float(order.get('filled') or order['amount'])
+        create_order = self.binance.create_spot_order if leg == 'spot' else self.binance.create_futures_order
         try:
-            # Check if we have a spot position
-            spot_position = self.binance.get_position(symbol)
-            if spot_position and float(spot_position.get('size', 0)) > 0:
-                self.binance.create_spot_order(
-                    symbol=symbol,
-                    order_type='MARKET',
-                    side='SELL',
-                    amount=float(spot_position['size'])  # Already in asset terms
-                )
-                logger.info(f"Closed partial spot position for {symbol}")
-                
-            # Check if we have a futures position
-            futures_position = self.binance.get_position(symbol)
-            if futures_position and float(futures_position.get('futures_size', 0)) > 0:
-                self.binance.create_futures_order(
-                    symbol=symbol,
-                    order_type='MARKET',
-                    side='BUY',
-                    amount=float(futures_position['futures_size'])  # Already in asset terms
-                )
-                logger.info(f"Closed partial futures position for {symbol}")
-                
+            await create_order(symbol=symbol, order_type='MARKET', side=side, amount=amount)
+            logger.info(f"Reversed {leg} leg for {symbol}: {side} {amount}")
         except Exception as e:
-            logger.error(f"Error handling failed trade for {symbol}: {str(e)}")
-
-    def monitor_positions(self):
+            logger.opt(exception=e).error("Failed to reverse {} leg for {}, it is left unhedged", leg, symbol)
+            
+    async def monitor_positions(self):
         """Monitor and manage open positions."""
-        for symbol in list(self.active_positions.keys()):
-            try:
-                position = self.active_positions[symbol]
+        positions = self.active_positions
+        if not positions:
+            return
+            
+        # One bulk request for every open symbol instead of one per position
+        funding_rates = await self.binance.get_all_funding_rates(tuple(positions))
+        self._record_rates(funding_rates)
+        
+        # Expired or normalized positions are found in one sweep over the column mirror
+        now = time.time()
+        due = self._position_table.due(now, self._last_rate)
+        
+        # Check every position concurrently so one slow symbol doesn't delay the others
+        checks = []
+        for symbol, position in positions.items():
+            idx = self._symbol_idx.get(symbol)
+            current_rate = funding_rates.get(symbol)
+            if idx is not None:
+                position_due = bool(due[idx])
+            else:  # Restored position for a pair that is no longer traded
+                position_due = (now - position['entry_time'] > TRADING_CONFIG.MAX_POSITION_DURATION
+                                or (current_rate is not None and current_rate >= _NORMALIZED_RATE))
+            checks.append(self._check_position(symbol, position, current_rate, position_due))
+        await asyncio.gather(*checks, return_exceptions=True)
+        
+    async def _check_position(self, symbol: str, position: Dict, current_rate: Optional[float], due: bool):
+        """Close a single position if any exit condition is met."""
+        try:
+            # Past the holding limit, funding has normalized, or one leg is left over from a partial close
+            if due or position['spot_size'] <= 0 or position['futures_size'] <= 0:
+                await self.close_position(symbol)
+                return
                 
-                # Check if we should exit the position
-                if self.binance.should_exit_position(symbol, position):
-                    self.close_position(symbol)
-                    continue
+            # Check if we should exit the position, reusing the rate fetched for this tick
+            if await self.binance.should_exit_position(symbol, position, current_rate):
+                await self.close_position(symbol)
                 
-                # Check other exit conditions
-                current_rate = self.binance.get_funding_rate(symbol)
-                if (current_rate >= -0.00005 or  # Funding rate has normalized
-                    time.time() - position['entry_time'] > TRADING_CONFIG['MAX_POSITION_DURATION']):  # Position open for too long
-                    self.close_position(symbol)
-                    
-            except Exception as e:
-                logger.error(f"Error monitoring position for {symbol}: {str(e)}")
+        except Exception as e:
+            logger.opt(exception=e).error("Error monitoring position for {}", symbol)
                 
-    def close_position(self, symbol: str):
+    async def close_position(self, symbol: str):
         """Close a position."""
-        if symbol not in self.active_positions:
-            return
-        position = self.active_positions[symbol]
-        # Only close if we have a spot position and size > 0
-        spot_position = self.binance.get_position(symbol)
-        if not spot_position or spot_position.get('size', 0) <= 0:
-            logger.warning(f"No spot position to close for {symbol}")
-            # Clean up the position from our tracking
-            del self.active_positions[symbol]
-            self._save_state()
+        position = self.active_positions.get(symbol)
+        if position is None:
             return
+        # Close every leg we track as open; one left over from an earlier partial close has the other at 0
+        spot_open = position['spot_size'] > 0
+        futures_open = position['futures_size'] > 0
         try:
-            # Close spot position (always market order)
-            spot_order = self.binance.create_spot_order(
-                symbol=symbol,
-                order_type='MARKET',
-                side='SELL',
-                amount=position['spot_size']  # Already in asset terms
+            # Close the open legs concurrently
+            spot_order, futures_order = await asyncio.gather(
+                # Spot leg (always market order)
+                self.binance.create_spot_order(
+                    symbol=symbol,
+                    order_type='MARKET',
+                    side='SELL',
+                    amount=position['spot_size']  # Already in asset terms
+                ) if spot_open else asyncio.sleep(0),
+                # Futures leg (let exchange client decide based on price advantage)
+                self.binance.create_futures_order(
+                    symbol=symbol,
+                    order_type='MARKET',  # This will be overridden if limit order is possible
+                    side='BUY',
+                    amount=position['futures_size']  # Already in asset terms
+                ) if futures_open else asyncio.sleep(0),
+                return_exceptions=True
             )
+            spot_failed = isinstance(spot_order, BaseException)
+            futures_failed = isinstance(futures_order, BaseException)
+            if spot_failed and (futures_failed or not futures_open):
+                raise spot_order
+            if futures_failed and not spot_open:
+                raise futures_order
             # Record spot close
-            self.reports.record_trade({
-                'symbol': symbol,
-                'type': 'CLOSE',
-                'side': 'SELL',
-                'amount': position['spot_size'] * spot_order['price'],  # Convert to USDT for reporting
-                'price': spot_order['price'],
-                'fees': spot_order['fee'],
-                'profit': (spot_order['price'] - position['spot_order']['price']) * position['spot_size'] - spot_order['fee']
-            })
-            # Close futures position (let exchange client decide based on price advantage)
-            futures_order = self.binance.create_futures_order(
-                symbol=symbol,
-                order_type='MARKET',  # This will be overridden if limit order is possible
-                side='BUY',
-                amount=position['futures_size']  # Already in asset terms
-            )
+            if spot_open and not spot_failed:
+                self.reports.record_trade(TradeRecord(
+                    symbol=symbol,
+                    type='CLOSE',
+                    side='SELL',
+                    amount=position['spot_size'] * spot_order['price'],  # Convert to USDT for reporting
+                    price=spot_order['price'],
+                    fees=spot_order['fee'],
+                    profit=(spot_order['price'] - position['spot_entry_price']) * position['spot_size'] - spot_order['fee']
+                ))
             # Record futures close
-            self.reports.record_trade({
-                'symbol': symbol,
-                'type': 'CLOSE',
-                'side': 'BUY',
-                'amount': position['futures_size'] * futures_order['price'],  # Convert to USDT for reporting
-                'price': futures_order['price'],
-                'fees': futures_order['fee'],
-                'profit': (position['futures_order']['price'] - futures_order['price']) * position['futures_size'] - futures_order['fee']
-            })
+            if futures_open and not futures_failed:
+                self.reports.record_trade(TradeRecord(
+                    symbol=symbol,
+                    type='CLOSE',
+                    side='BUY',
+                    amount=position['futures_size'] * futures_order['price'],  # Convert to USDT for reporting
+                    price=futures_order['price'],
+                    fees=futures_order['fee'],
+                    profit=(position['futures_entry_price'] - futures_order['price']) * position['futures_size'] - futures_order['fee']
+                ))
+            self._invalidate_balance()
+            # One leg failed: keep tracking only the leg still open so the next monitor tick retries it
+            if spot_failed or futures_failed:
+                failed_leg, error = ('spot', spot_order) if spot_failed else ('futures', futures_order)
+                logger.error(f"Failed to close {failed_leg} leg for {symbol}, will retry: {error}")
+                closed_leg = 'futures' if spot_failed else 'spot'
+                self._set_position(symbol, {**position, f'{closed_leg}_size': 0})
+                self._mark_state_dirty()
+                return
             logger.info(f"Closed position for {symbol}")
             logger.info(f"Expected profit: {position['expected_profit']:.2f} USDT")
             # Print live update with actual balance
-            self.reports.print_live_updates(self.binance.get_balance())
+            self.reports.print_live_updates(await self._cached_balance())
             # Clean up the position
-            del self.active_positions[symbol]
-            self._save_state()
+            self._drop_position(symbol)
+            self._mark_state_dirty()
         except Exception as e:
             logger.error(f"Failed to close position for {symbol}: {str(e)}")
             # If we get an error about insufficient position, clean up our tracking
             if "Insufficient spot position" in str(e):
-                del self.active_positions[symbol]
-                self._save_state()
+                self._drop_position(symbol)
+                self._mark_state_dirty()
             
-    def run(self):
-        """Main bot loop."""
-        logger.info("Starting Funding Rate Arbitrage Bot")
+    async def _shutdown(self):
+        """Close open positions, write the final report and release the exchange client."""
+        logger.info("Shutting down...")
         
-        def signal_handler(signum, frame):
-            logger.info("Shutting down...")
-            if self.active_positions:
-                logger.info("Closing all open positions...")
-                for symbol in list(self.active_positions.keys()):
-                    self.close_position(symbol)
-                    
-            # Generate final performance report
-            self.reports.generate_performance_report()
-            sys.exit(0)
-            
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        # Stop streamed evaluations so nothing opens while we close
+        self._shutting_down = True
+        pending = list(self._pending_evaluations.values())
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        
+        positions = self.active_positions
+        if positions:
+            logger.info("Closing all open positions...")
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*(self.close_position(symbol) for symbol in positions), return_exceptions=True),
+                    timeout=MONITORING_CONFIG['SHUTDOWN_TIMEOUT']
+                )
+            except asyncio.TimeoutError:
+                logger.error(f"Timed out closing positions, still open: {', '.join(self.active_positions)}")
+                
+        # Flush any change the state writer has not persisted yet
+        self._save_state()
+        self._state_store.close()
         
+        # Generate final performance report
+        self.reports.flush()
+        self.reports.generate_performance_report()
+        await self.binance.close()
+        await logger.complete()  # Drain queued log records before the loop exits
+            
+    async def _run_periodic(self, name: str, tick, interval: float, wakeup: Optional[asyncio.Event] = None):
+        """Run tick every interval seconds, or as soon as wakeup is set, backing off for a minute after an unexpected error."""
         while True:
             try:
-                logger.info("Starting main loop iteration...")
-                self.check_opportunities()
-                logger.info("Finished checking opportunities")
-                self.monitor_positions()
-                logger.info("Finished monitoring positions")
-                logger.info(f"Sleeping for {MONITORING_CONFIG['POSITION_CHECK_INTERVAL']} seconds...")
-                time.sleep(MONITORING_CONFIG['POSITION_CHECK_INTERVAL'])
+                await tick()
+                if wakeup is None:
+                    await asyncio.sleep(interval)
+                    continue
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=interval)
+                except asyncio.TimeoutError:
+                    pass
+                wakeup.clear()
             except Exception as e:
-                logger.error(f"Error in main loop: {str(e)}")
-                logger.error(f"Error type: {type(e)}")
-                import traceback
-                logger.error(f"Traceback: {traceback.format_exc()}")
-                time.sleep(60)  # Wait a minute before retrying
+                logger.opt(exception=e).error(f"Error in {name} loop")
+                await asyncio.sleep(60)  # Wait a minute before retrying
                 
-if __name__ == "__main__":
+    async def _opportunity_loop(self):
+        """Periodic fallback scan for opportunities the funding stream did not trigger."""
+        await self._run_periodic('opportunity', self.check_opportunities, MONITORING_CONFIG['CHECK_INTERVAL'])
+        
+    async def _monitor_loop(self):
+        """Check open positions for exit conditions on their own cadence."""
+        await self._run_periodic('monitor', self.monitor_positions, MONITORING_CONFIG['POSITION_CHECK_INTERVAL'],
+                                 wakeup=self._monitor_wakeup)
+            
+    async def run(self):
+        """Run the opportunity and monitor loops until interrupted."""
+        logger.info("Starting Funding Rate Arbitrage Bot")
+        
+        # Cancel the loops on SIGINT/SIGTERM and shut down from inside the event loop
+        loop = asyncio.get_running_loop()
+        main_task = asyncio.current_task()
+        loop.add_signal_handler(signal.SIGINT, main_task.cancel)
+        loop.add_signal_handler(signal.SIGTERM, main_task.cancel)
+        
+        try:
+            await asyncio.gather(self._opportunity_loop(), self._monitor_loop(), self._state_writer())
+        except asyncio.CancelledError:
+            await self._shutdown()
+
+async def main():
     bot = FundingRateBot()
-    bot.run() 
\ No newline at end of file
+    await bot.initialize()
+    await bot.run()
+                
+if __name__ == "__main__":
+    # libuv-based event loop where available; the default loop works everywhere else
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    asyncio.run(main())
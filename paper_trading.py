@@ -1,38 +1,79 @@
 import time
-from typing import Dict, Optional, List
+from collections import deque
+from itertools import count
+from typing import Callable, Deque, Dict, Optional, List, Sequence, Tuple
 from loguru import logger
-import random
-from config import TRADING_CONFIG
+from config import TRADING_CONFIG, SPOT_FEE, FUTURES_FEE
 from exchange_clients import BinanceClient
 
+# Market data reused across the legs of one simulated trade
+_PRICE_CACHE_TTL = 0.25
+_FUNDING_CACHE_TTL = 5  # Funding rates move slowly
+
+# Most recent simulated orders kept in memory
+_ORDER_HISTORY_SIZE = 10_000
+
 class PaperTradingClient:
-    def __init__(self, initial_balance: float = 1000.0):
+    def __init__(self, initial_balance: float = 1000.0, binance_client: Optional[BinanceClient] = None):
         self.balance = initial_balance
         self.positions: Dict[str, Dict] = {}
-        self.order_history: List[Dict] = []
-        # Use real Binance client for market data
-        self.real_binance = BinanceClient()
+        self.order_history: Deque[Dict] = deque(maxlen=_ORDER_HISTORY_SIZE)
+        self._order_ids = count()  # Unique even once old orders drop out of the history
+        # Use real Binance client for market data (optionally shared between paper clients)
+        self.real_binance = binance_client or BinanceClient()
+        self._price_cache: Dict[Tuple[str, str], Tuple[float, float]] = {}  # (symbol, side) -> (price, fetched at)
+        self._funding_cache: Dict[str, Tuple[float, float]] = {}  # symbol -> (rate, fetched at)
+
+    async def connect(self):
+        """Nothing to verify: market data is public and the exchange clients are created on first use."""
+
+    async def close(self):
+        """Close the underlying Binance client."""
+        await self.real_binance.close()
+
+    async def start_streams(self, symbols: Sequence[str]):
+        """Subscribe to real market data streams from Binance."""
+        await self.real_binance.start_streams(symbols)
+
+    def add_funding_listener(self, listener: Callable[[Dict[str, float]], None]):
+        """Receive real streamed funding rate updates from Binance."""
+        self.real_binance.add_funding_listener(listener)
         
-    def get_funding_rate(self, symbol: str) -> float:
+    async def get_funding_rate(self, symbol: str) -> float:
         """Get real funding rate from Binance."""
-        return self.real_binance.get_funding_rate(symbol)
+        cached = self._funding_cache.get(symbol)
+        if cached is not None and time.monotonic() - cached[1] < _FUNDING_CACHE_TTL:
+            return cached[0]
+        funding_rate = await self.real_binance.get_funding_rate(symbol)
+        self._funding_cache[symbol] = (funding_rate, time.monotonic())
+        return funding_rate
+
+    async def get_all_funding_rates(self, symbols: Sequence[str]) -> Dict[str, float]:
+        """Get real funding rates for several symbols from Binance."""
+        return await self.real_binance.get_all_funding_rates(symbols)
         
-    def get_order_book(self, symbol: str, limit: int = 10) -> Dict:
+    async def get_order_book(self, symbol: str, limit: int = 10) -> Dict:
         """Get real order book from Binance."""
-        return self.real_binance.get_order_book(symbol, limit)
+        return await self.real_binance.get_order_book(symbol, limit)
         
-    def get_best_maker_price(self, symbol: str, side: str) -> Optional[float]:
+    async def get_best_maker_price(self, symbol: str, side: str) -> Optional[float]:
         """Get real best maker price from Binance."""
-        return self.real_binance.get_best_maker_price(symbol, side)
-        
-    def create_spot_order(self, symbol: str, order_type: str, side: str, 
+        key = (symbol, side)
+        cached = self._price_cache.get(key)
+        if cached is not None and time.monotonic() - cached[1] < _PRICE_CACHE_TTL:
+            return cached[0]
+        price = await self.real_binance.get_best_maker_price(symbol, side)
+        if price is None:
+            self._price_cache.pop(key, None)  # Failed lookups are retried on the next call
+        else:
+            self._price_cache[key] = (price, time.monotonic())
+        return price
+        
+    async def create_spot_order(self, symbol: str, order_type: str, side: str, 
                          amount: float, price: Optional[float] = None) -> Dict:
         """Simulate creating a spot order."""
         # Get real price from Binance
-        order_price = price or self.get_best_maker_price(symbol, side)
-        
-        # Calculate fees based on real rates
-        fee_rate = 0.00075  # 0.075% with BNB
+        order_price = price or await self.get_best_maker_price(symbol, side)
         
         # Handle amount conversion
         # If amount is very small (< 0.1), assume it's already in asset terms
@@ -42,17 +83,17 @@ class PaperTradingClient:
         else:  # This is likely already in asset terms
             asset_amount = amount
             
-        fee = asset_amount * order_price * fee_rate
+        fee = asset_amount * order_price * SPOT_FEE
         
         order = {
-            'id': f"paper_spot_{len(self.order_history)}",
+            'id': f"paper_spot_{next(self._order_ids)}",
             'symbol': symbol,
             'type': order_type,
             'side': side,
             'amount': asset_amount,  # Store in asset terms
             'price': order_price,
             'fee': fee,
-            'timestamp': int(time.time() * 1000),
+            'timestamp': time.time_ns() // 1_000_000,
             'status': 'closed'
         }
         
@@ -64,104 +105,106 @@ class PaperTradingClient:
             self.balance -= total_cost
             
             # Track spot position in asset terms
-            if symbol not in self.positions:
-                self.positions[symbol] = {'spot': 0, 'futures': 0}
-            self.positions[symbol]['spot'] = asset_amount  # Store exact amount
+            self.positions.setdefault(symbol, {'spot': 0, 'futures': 0})['spot'] = asset_amount  # Store exact amount
             
         else:  # SELL
-            if symbol not in self.positions or self.positions[symbol]['spot'] < asset_amount:
+            position = self.positions.get(symbol)
+            if position is None or position['spot'] < asset_amount:
                 raise ValueError(f"Insufficient spot position: {asset_amount} {symbol}")
             
             self.balance += (asset_amount * order_price) - fee
-            self.positions[symbol]['spot'] = 0  # Clear position
-            
-            # Clean up empty positions
-            if self.positions[symbol]['spot'] == 0 and self.positions[symbol]['futures'] == 0:
-                del self.positions[symbol]
+            self._clear_leg(symbol, position, 'spot')
             
         self.order_history.append(order)
-        logger.info(f"Paper trading: Created {side} spot order for {symbol}: {asset_amount} @ {order_price} (fee: {fee:.2f} USDT)")
-        logger.info(f"Current balance: {self.balance:.2f} USDT")
+        # Arguments are only formatted if a sink accepts INFO
+        logger.info("Paper trading: Created {} spot order for {}: {} @ {} (fee: {:.2f} USDT, balance: {:.2f} USDT)",
+                    side, symbol, asset_amount, order_price, fee, self.balance)
         return order
         
-    def create_futures_order(self, symbol: str, order_type: str, side: str, 
+    async def create_futures_order(self, symbol: str, order_type: str, side: str, 
                            amount: float, price: Optional[float] = None) -> Dict:
         """Simulate creating a futures order."""
         # Get real price from Binance
-        order_price = price or self.get_best_maker_price(symbol, side)
-        
-        # Calculate fees based on real rates
-        fee_rate = 0.0004  # 0.04% taker fee
+        order_price = price or await self.get_best_maker_price(symbol, side)
         
         # Convert USDT amount to asset amount for futures orders
         asset_amount = amount / order_price
-        fee = asset_amount * order_price * fee_rate
+        fee = asset_amount * order_price * FUTURES_FEE
         
         order = {
-            'id': f"paper_futures_{len(self.order_history)}",
+            'id': f"paper_futures_{next(self._order_ids)}",
             'symbol': symbol,
             'type': order_type,
             'side': side,
             'amount': asset_amount,  # Store in asset terms
             'price': order_price,
             'fee': fee,
-            'timestamp': int(time.time() * 1000),
+            'timestamp': time.time_ns() // 1_000_000,
             'status': 'closed'
         }
         
         # Track futures position
-        if symbol not in self.positions:
-            self.positions[symbol] = {'spot': 0, 'futures': 0}
-            
         if side == 'SELL':
-            self.positions[symbol]['futures'] = asset_amount  # Store exact amount
+            self.positions.setdefault(symbol, {'spot': 0, 'futures': 0})['futures'] = asset_amount  # Store exact amount
         else:  # BUY
-            if self.positions[symbol]['futures'] < asset_amount:
+            position = self.positions.get(symbol)
+            if position is None or position['futures'] < asset_amount:
                 raise ValueError(f"Insufficient futures position: {asset_amount} {symbol}")
-            self.positions[symbol]['futures'] = 0  # Clear position
-            
-        # Clean up empty positions
-        if self.positions[symbol]['spot'] == 0 and self.positions[symbol]['futures'] == 0:
-            del self.positions[symbol]
+            self._clear_leg(symbol, position, 'futures')
             
         self.order_history.append(order)
-        logger.info(f"Paper trading: Created {side} futures order for {symbol}: {asset_amount} @ {order_price} (fee: {fee:.2f} USDT)")
+        logger.info("Paper trading: Created {} futures order for {}: {} @ {} (fee: {:.2f} USDT)",
+                    side, symbol, asset_amount, order_price, fee)
         return order
         
-    def get_balance(self, currency: str = 'USDT') -> float:
+    def _clear_leg(self, symbol: str, position: Dict, leg: str):
+        """Close one leg of a position, dropping the position once both legs are flat."""
+        position[leg] = 0
+        if position['spot'] == 0 and position['futures'] == 0:
+            del self.positions[symbol]
+            
+    async def get_balance(self, currency: str = 'USDT') -> float:
         """Get simulated balance."""
         return self.balance
         
-    def set_leverage(self, symbol: str, leverage: int) -> bool:
+    async def set_leverage(self, symbol: str, leverage: int) -> bool:
         """Simulate setting leverage."""
         logger.info(f"Paper trading: Set leverage for {symbol} to {leverage}x")
         return True
         
-    def get_position(self, symbol: str) -> Dict:
-        """Get simulated position."""
-        if symbol not in self.positions:
-            return {}
+    async def get_positions(self) -> Dict[str, Dict]:
+        """Get all simulated positions keyed by symbol."""
         return {
-            'symbol': symbol,
-            'size': self.positions[symbol]['spot'],  # Already in asset terms
-            'futures_size': self.positions[symbol]['futures']  # Already in asset terms
+            symbol: {
+                'symbol': symbol,
+                'size': position['spot'],  # Already in asset terms
+                'futures_size': position['futures'],  # Already in asset terms
+                'contracts': position['futures']  # Same field as the live client's ccxt positions
+            }
+            for symbol, position in self.positions.items()
         }
         
-    def check_liquidity(self, symbol: str, min_liquidity: float = None) -> bool:
+    async def check_liquidity(self, symbol: str, min_liquidity: float = None) -> bool:
         """Check real liquidity from Binance."""
-        return self.real_binance.check_liquidity(symbol, min_liquidity)
+        return await self.real_binance.check_liquidity(symbol, min_liquidity)
         
-    def get_funding_rate_history(self, symbol: str, limit: int = 10) -> List[Dict]:
+    async def get_funding_rate_history(self, symbol: str, limit: int = 10) -> List[Dict]:
         """Get real funding rate history from Binance."""
-        return self.real_binance.get_funding_rate_history(symbol, limit)
+        return await self.real_binance.get_funding_rate_history(symbol, limit)
         
-    def calculate_profitability_analysis(self, symbol: str, position_size: float) -> Dict:
+    async def calculate_profitability_analysis(self, symbol: str, position_size: float) -> Dict:
         """Calculate real profitability analysis using Binance data."""
-        return self.real_binance.calculate_profitability_analysis(symbol, position_size)
+        return await self.real_binance.calculate_profitability_analysis(symbol, position_size)
+        
+    async def calculate_profitability_analysis_batch(self, symbols: Sequence[str],
+                                                     position_sizes: Sequence[float]) -> Dict[str, Dict]:
+        """Calculate real profitability analyses for several symbols using Binance data."""
+        return await self.real_binance.calculate_profitability_analysis_batch(symbols, position_sizes)
         
-    def should_exit_position(self, symbol: str, position: Dict) -> bool:
-        from config import TRADING_CONFIG  # Ensure always available
-        current_rate = self.get_funding_rate(symbol)
+    async def should_exit_position(self, symbol: str, position: Dict,
+                                   current_rate: Optional[float] = None) -> bool:
+        if current_rate is None:
+            current_rate = await self.get_funding_rate(symbol)
         entry_rate = position.get('entry_rate', 0)
         
         # Exit if funding rate has improved significantly
@@ -176,13 +219,13 @@ class PaperTradingClient:
             
         # Exit if position has been open too long
         position_age = time.time() - position.get('entry_time', 0)
-        if position_age > TRADING_CONFIG['MAX_POSITION_DURATION']:
-            logger.info(f"Exiting {symbol} position: reached maximum duration of {TRADING_CONFIG['MAX_POSITION_DURATION']/3600:.1f} hours")
+        if position_age > TRADING_CONFIG.MAX_POSITION_DURATION:
+            logger.info(f"Exiting {symbol} position: reached maximum duration of {TRADING_CONFIG.MAX_POSITION_DURATION/3600:.1f} hours")
             return True
             
         return False
         
-    def calculate_expected_profit(self, symbol: str, position_size: float, 
+    async def calculate_expected_profit(self, symbol: str, position_size: float, 
                                 current_rate: float) -> float:
         """Calculate real expected profit using Binance data."""
-        return self.real_binance.calculate_expected_profit(symbol, position_size, current_rate) 
\ No newline at end of file
+        return await self.real_binance.calculate_expected_profit(symbol, position_size, current_rate) 
\ No newline at end of file
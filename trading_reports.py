@@ -1,69 +1,152 @@
-import json
+import csv
+import orjson
+import os
+import time
+from dataclasses import dataclass
+from collections import Counter
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List
 from loguru import logger
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
 
+# Columns of the exported trade history, in record_trade order
+_TRADE_FIELDS = ['id', 'timestamp', 'date', 'symbol', 'type', 'side', 'amount', 'price', 'fees', 'funding_rate', 'profit']
+
+# performance.json is rewritten at most every this many trades or seconds
+_PERFORMANCE_SAVE_TRADES = 50
+_PERFORMANCE_SAVE_INTERVAL = 5
+
+@dataclass(slots=True)
+class TradeRecord:
+    """One executed leg as reported by the bot."""
+    symbol: str
+    type: str  # 'OPEN' or 'CLOSE'
+    side: str
+    amount: float
+    price: float
+    fees: float
+    funding_rate: float = 0.0
+    profit: float = 0.0
+    
 class TradingReports:
     def __init__(self, reports_dir: str = "reports"):
         self.reports_dir = Path(reports_dir)
         self.reports_dir.mkdir(exist_ok=True)
-        self.trades_file = self.reports_dir / "trades.json"
+        self.trades_file = self.reports_dir / "trades.jsonl"  # Append-only, one trade per line
         self.performance_file = self.reports_dir / "performance.json"
+        self._unsaved_trades = 0
+        self._last_performance_save = time.monotonic()
         self.trades: List[Dict] = []
-        self.performance: Dict = {
-            'initial_balance': 0,
-            'current_balance': 0,
+        self.performance: Dict = self._empty_performance(0)
+        self._load_data()
+        
+    @staticmethod
+    def _empty_performance(initial_balance: float) -> Dict:
+        """Performance metrics before any trade."""
+        return {
+            'initial_balance': initial_balance,
+            'current_balance': initial_balance,
             'total_profit': 0,
             'total_trades': 0,
             'winning_trades': 0,
             'losing_trades': 0,
             'total_fees': 0,
             'max_drawdown': 0,
-            'daily_profits': {},
-            'trade_history': []
+            'daily_profits': {}
         }
-        self._load_data()
         
     def _load_data(self):
         """Load existing trade and performance data."""
         if self.trades_file.exists():
-            with open(self.trades_file, 'r') as f:
-                self.trades = json.load(f)
-                
+            with open(self.trades_file, 'rb') as f:
+                for line in f:
+                    try:
+                        self.trades.append(orjson.loads(line))
+                    except ValueError:  # orjson.JSONDecodeError subclasses ValueError
+                        logger.warning(f"Skipping unreadable line in {self.trades_file}")
+        else:
+            legacy_file = self.trades_file.with_suffix('.json')
+            if legacy_file.exists():
+                # One-time conversion from the old single-document format
+                self.trades = orjson.loads(legacy_file.read_bytes())
+                with open(self.trades_file, 'wb') as f:
+                    f.writelines(orjson.dumps(trade, option=orjson.OPT_APPEND_NEWLINE) for trade in self.trades)
+                    
         if self.performance_file.exists():
-            with open(self.performance_file, 'r') as f:
-                self.performance = json.load(f)
+            self.performance = orjson.loads(self.performance_file.read_bytes())
+            # Older files kept a second copy of every trade; fold it into the trades log once
+            trade_history = self.performance.pop('trade_history', None)
+            if trade_history is not None:
+                known = {trade['id'] for trade in self.trades}
+                for trade in trade_history:
+                    if trade['id'] not in known:
+                        self.trades.append(trade)
+                        self._append_trade(trade)
+                        
+        # trades.jsonl is written on every trade while performance.json is debounced, so after a
+        # crash the metrics can lag the log: replay the log and rewrite the file if they differ
+        loaded = self.performance
+        self.performance = self._empty_performance(loaded.get('initial_balance', 0))
+        for trade in self.trades:
+            self._update_performance(trade)
+        if self.performance != loaded:
+            self._save_performance()
                 
-    def _save_data(self):
-        """Save trade and performance data."""
-        with open(self.trades_file, 'w') as f:
-            json.dump(self.trades, f, indent=2)
+    @property
+    def trade_history(self) -> List[Dict]:
+        """All recorded trades (kept for compatibility with the old performance layout)."""
+        return self.trades
+        
+    def _append_trade(self, trade: Dict):
+        """Append one trade to the trades log."""
+        with open(self.trades_file, 'ab') as f:
+            f.write(orjson.dumps(trade, option=orjson.OPT_APPEND_NEWLINE))
+            
+    def _save_performance(self):
+        """Atomically replace the performance file."""
+        tmp_file = self.performance_file.with_suffix('.json.tmp')
+        tmp_file.write_bytes(orjson.dumps(self.performance, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_file, self.performance_file)
+        self._unsaved_trades = 0
+        self._last_performance_save = time.monotonic()
+        
+    def _maybe_save_performance(self):
+        """Save performance once enough trades or time have accumulated since the last save."""
+        self._unsaved_trades += 1
+        if (self._unsaved_trades >= _PERFORMANCE_SAVE_TRADES
+                or time.monotonic() - self._last_performance_save >= _PERFORMANCE_SAVE_INTERVAL):
+            self._save_performance()
             
-        with open(self.performance_file, 'w') as f:
-            json.dump(self.performance, f, indent=2)
+    def flush(self):
+        """Write out any performance changes not yet saved."""
+        if self._unsaved_trades:
+            try:
+                self._save_performance()
+            except OSError as e:
+                logger.error(f"Error saving performance data: {e}")
             
-    def record_trade(self, trade_data: Dict):
+    def record_trade(self, trade_data: TradeRecord):
         """Record a new trade."""
+        now = datetime.now()
         trade = {
             'id': len(self.trades),
-            'timestamp': datetime.now().isoformat(),
-            'symbol': trade_data['symbol'],
-            'type': trade_data['type'],  # 'OPEN' or 'CLOSE'
-            'side': trade_data['side'],
-            'amount': trade_data['amount'],
-            'price': trade_data['price'],
-            'fees': trade_data['fees'],
-            'funding_rate': trade_data.get('funding_rate', 0),
-            'profit': trade_data.get('profit', 0)
+            'timestamp': now.isoformat(),
+            'date': now.date().isoformat(),
+            'symbol': trade_data.symbol,
+            'type': trade_data.type,
+            'side': trade_data.side,
+            'amount': trade_data.amount,
+            'price': trade_data.price,
+            'fees': trade_data.fees,
+            'funding_rate': trade_data.funding_rate,
+            'profit': trade_data.profit
         }
         
         self.trades.append(trade)
+        self._append_trade(trade)
         self._update_performance(trade)
-        self._save_data()
+        self._maybe_save_performance()
         
     def _update_performance(self, trade: Dict):
         """Update performance metrics based on new trade."""
@@ -82,7 +165,7 @@ class TradingReports:
                 self.performance['losing_trades'] += 1
                 
             # Update daily profits
-            date = datetime.fromisoformat(trade['timestamp']).date().isoformat()
+            date = trade.get('date') or trade['timestamp'][:10]  # Older trades only have the timestamp
             self.performance['daily_profits'][date] = self.performance['daily_profits'].get(date, 0) + profit
             
             # Update max drawdown
@@ -90,14 +173,11 @@ class TradingReports:
                 drawdown = (self.performance['initial_balance'] - self.performance['current_balance']) / self.performance['initial_balance']
                 self.performance['max_drawdown'] = max(self.performance['max_drawdown'], drawdown)
                 
-        # Record trade in history
-        self.performance['trade_history'].append(trade)
-        
     def set_initial_balance(self, balance: float):
         """Set the initial balance for performance tracking."""
         self.performance['initial_balance'] = balance
         self.performance['current_balance'] = balance
-        self._save_data()
+        self._save_performance()
         
     def get_performance_summary(self) -> Dict:
         """Get a summary of trading performance."""
@@ -143,26 +223,32 @@ class TradingReports:
                 f.write(f"{key.replace('_', ' ').title()}: {value}\n")
                 
         # Generate trade history
-        df = pd.DataFrame(self.trades)
-        df.to_csv(report_dir / "trade_history.csv", index=False)
+        with open(report_dir / "trade_history.csv", 'w', newline='') as f:
+            writer = csv.DictWriter(f, _TRADE_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(self.trades)
         
         # Generate charts
-        self._generate_charts(df, report_dir)
+        self._generate_charts(report_dir)
         
         logger.info(f"Performance report generated in {report_dir}")
         
-    def _generate_charts(self, df: pd.DataFrame, report_dir: Path):
+    def _generate_charts(self, report_dir: Path):
         """Generate performance charts."""
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
         # Set style
         sns.set_style("whitegrid")
         plt.rcParams['figure.figsize'] = [12, 6]
         
-        # Daily P&L
-        df['date'] = pd.to_datetime(df['timestamp']).dt.date
-        daily_pnl = df[df['type'] == 'CLOSE'].groupby('date')['profit'].sum()
+        # Daily P&L, already aggregated per day by _update_performance
+        daily_profits = self.performance['daily_profits']
+        dates = sorted(daily_profits)  # ISO dates sort chronologically
+        daily_pnl = np.fromiter((daily_profits[date] for date in dates), dtype=np.float64, count=len(dates))
         
         plt.figure()
-        daily_pnl.plot(kind='bar')
+        plt.bar(dates, daily_pnl)
         plt.title('Daily Profit/Loss')
         plt.xlabel('Date')
         plt.ylabel('Profit/Loss (USDT)')
@@ -173,7 +259,7 @@ class TradingReports:
         
         # Cumulative P&L
         plt.figure()
-        daily_pnl.cumsum().plot()
+        plt.plot(dates, daily_pnl.cumsum())
         plt.title('Cumulative Profit/Loss')
         plt.xlabel('Date')
         plt.ylabel('Cumulative Profit/Loss (USDT)')
@@ -183,8 +269,10 @@ class TradingReports:
         plt.close()
         
         # Trade distribution by symbol
+        closed = Counter(trade['symbol'] for trade in self.trades if trade['type'] == 'CLOSE').most_common()
         plt.figure()
-        df[df['type'] == 'CLOSE']['symbol'].value_counts().plot(kind='pie', autopct='%1.1f%%')
+        if closed:
+            plt.pie([count for _, count in closed], labels=[symbol for symbol, _ in closed], autopct='%1.1f%%')
         plt.title('Trade Distribution by Symbol')
         plt.tight_layout()
         plt.savefig(report_dir / "trade_distribution.png")